@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Time the resolver's hot paths and compare them with a stored baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_resolver                   # compare with the baseline
+    python -m benchmarks.bench_resolver --save-baseline   # record a new baseline
+    python -m benchmarks.bench_resolver --quick           # skip the 100k-entry cases
+
+Each case reports the median and best time per call. Timings are also
+divided by a fixed pure-Python calibration loop measured in the same run,
+and the comparison uses these normalized figures, so a baseline recorded on
+one machine stays meaningful on a faster or slower one. A case whose
+normalized median grows by more than `--tolerance` (default 50%) over the
+baseline is a regression and makes the command exit non-zero, unless
+`--report-only` is given. Cases under `MIN_COMPARED_SECONDS` per call (the
+warm known-order lookups) are timed and printed but not compared: at a few
+microseconds, timer and scheduler noise outweighs any real change.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from unittest.mock import patch
+
+from benchmarks.bench_text_scanner import FILLER, ORDER
+from src.api.artifacts import ArtifactWriter
+from src.api.check_status import UTC, FlagStatusChecker, KnownOrderIndex
+from src.api.history_log import HistoryLog
+
+NOW = datetime(2026, 7, 12, 18, 0, tzinfo=UTC)
+BASELINE = os.path.join("benchmarks", "baseline.json")
+RESULTS = os.path.join(".cache", "benchmarks", "results.json")
+MIN_COMPARED_SECONDS = 0.001
+
+
+class Response:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+
+def measure(function: Callable[[], object], repeat: int, number: int = 1, warmup: int = 1) -> Dict:
+    """Median and best seconds per call over `repeat` samples of `number` calls."""
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - started) / number)
+    return {"seconds": statistics.median(timings), "best": min(timings), "runs": repeat * number}
+
+
+def calibrate() -> float:
+    """A fixed interpreter workload used to normalize timings across machines."""
+
+    def workload():
+        total = 0
+        for value in range(200_000):
+            total += value % 7
+        return {str(key): key for key in range(20_000)}
+
+    return measure(workload, repeat=15)["best"]
+
+
+def proclamation(paragraphs: int) -> str:
+    return FILLER * paragraphs + ORDER
+
+
+def article_html(paragraphs: int) -> bytes:
+    navigation = "".join(f'<li><a href="/briefings/{n}/">Briefing {n}</a></li>' for n in range(300))
+    body = "".join(f"<p>{FILLER}</p>" for _ in range(paragraphs))
+    return (
+        "<!doctype html><html><head><title>Proclamation</title>"
+        "<script>window.dataLayer = [];" + "var x = 1;" * 2000 + "</script>"
+        "<style>" + "p { margin: 0 }" * 500 + "</style></head><body>"
+        f"<nav><ul>{navigation}</ul></nav><main>{body}<p>{ORDER}</p></main></body></html>"
+    ).encode("utf-8")
+
+
+def rss_feed(items: int) -> bytes:
+    titles = (
+        "President orders all American flags lowered to half-staff to honor {n}",
+        "Governor orders state flags at half-staff for firefighter {n}",
+        "Markets close higher as investors weigh report {n}",
+        "Flags return to full-staff across the state after observance {n}",
+    )
+    published = "Sun, 12 Jul 2026 17:30:00 GMT"
+    body = "".join(
+        f"<item><title>{titles[n % len(titles)].format(n=n)} - Outlet {n % 40}</title>"
+        f"<link>https://www.bing.com/news/apiclick.aspx?url=https%3A%2F%2Fexample.com%2F{n}</link>"
+        f"<guid>story-{n}</guid><pubDate>{published}</pubDate></item>"
+        for n in range(items)
+    )
+    return f"<?xml version='1.0'?><rss><channel>{body}</channel></rss>".encode("utf-8")
+
+
+def bench_parse_expiration(paragraphs: int, repeat: int) -> Dict:
+    checker = FlagStatusChecker(now=NOW)
+    text = proclamation(paragraphs)
+    assert checker._parse_expiration(text)
+    return measure(lambda: checker._parse_expiration(text), repeat, number=10)
+
+
+def bench_headlines(items: int, repeat: int) -> Dict:
+    checker = FlagStatusChecker(now=NOW)
+    checker.news_queries = ("all American flags lowered half staff",)
+    feed = rss_feed(items)
+    checker._news_feed = lambda query: feed
+    assert len(list(checker._news_candidates())) == -(-items // 4)
+    return measure(lambda: list(checker._news_candidates()), repeat)
+
+
+def bench_article_signal(paragraphs: int, repeat: int) -> Dict:
+    checker = FlagStatusChecker(now=NOW)
+    url = "https://www.whitehouse.gov/presidential-actions/2026/07/proclamation/"
+    response = Response(article_html(paragraphs))
+
+    def classify():
+        # A fresh memo each time, so every call parses and classifies the page.
+        checker._articles = {}
+        return checker._whitehouse_article_signal(url)
+
+    with patch.object(checker, "_get", return_value=response):
+        assert classify()["status"] == "half-staff"
+        return measure(classify, repeat)
+
+
+def bench_append_history(entries: int, repeat: int) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        log_dir = Path(directory, "log")
+        log_dir.mkdir()
+        start = NOW - timedelta(hours=entries)
+        with open(log_dir / "2026.jsonl", "w", encoding="utf-8") as handle:
+            for seq in range(1, entries + 1):
+                entry = {
+                    "date": (start + timedelta(hours=seq)).isoformat(),
+                    "status": "half-staff" if seq % 2 else "full-staff",
+                    "reason": f"Observance {seq}",
+                    "source": "HalfStaff.org",
+                }
+                handle.write(json.dumps({"seq": seq, "recorded": entry["date"], "entry": entry}) + "\n")
+
+        checker = FlagStatusChecker(now=NOW)
+        checker.history_file = str(Path(directory, "api", "history.json"))
+        checker.history_log = HistoryLog(str(log_dir))
+        checker.artifacts = ArtifactWriter(str(Path(directory, "api", "manifest.json")))
+        state = {"count": 0}
+
+        def append():
+            state["count"] += 1
+            checker.now = NOW + timedelta(minutes=state["count"])
+            checker._append_history(
+                {
+                    "status": "full-staff" if (entries + state["count"]) % 2 == 0 else "half-staff",
+                    "reason": f"Benchmark transition {state['count']}",
+                    "source": "Benchmark",
+                    "last_updated": checker.now.isoformat(),
+                }
+            )
+
+        return measure(append, repeat)
+
+
+def bench_known_orders(orders: int, repeat: int) -> Dict[str, Dict]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory, "orders.json"))
+        registry = []
+        for n in range(orders):
+            starts = datetime(2000, 1, 1, tzinfo=UTC) + timedelta(hours=6 * n)
+            registry.append(
+                {
+                    "id": f"order-{n}",
+                    "starts": starts.isoformat(),
+                    "expires": (starts + timedelta(days=n % 9 + 1)).isoformat(),
+                    "reason": f"Order {n}",
+                    "source": "Official order",
+                    "source_url": f"https://example.gov/orders/{n}",
+                }
+            )
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"orders": registry}, handle)
+
+        checker = FlagStatusChecker(now=datetime(2000, 1, 1, tzinfo=UTC) + timedelta(hours=3 * orders))
+        checker.known_orders_file = path
+
+        def cold():
+            KnownOrderIndex._cache.pop(path, None)
+            return checker.check_known_orders()
+
+        assert cold()
+        return {
+            "cold": measure(cold, repeat),
+            "warm": measure(checker.check_known_orders, repeat, number=2000),
+        }
+
+
+def run(quick: bool = False) -> Dict:
+    calibration = calibrate()
+    cases: Dict[str, Dict] = {}
+
+    def record(name: str, result: Dict) -> None:
+        result["normalized"] = result["seconds"] / calibration
+        cases[name] = result
+        print(f"{name:<44} {result['seconds'] * 1000:>10.3f} ms  (best {result['best'] * 1000:.3f} ms)")
+
+    record("parse_expiration[400 paragraphs]", bench_parse_expiration(400, 9))
+    record("headlines[5000 items]", bench_headlines(5000, 5))
+    record("whitehouse_article_signal[2500 paragraphs]", bench_article_signal(2500, 5))
+    for entries in (200, 10_000) if quick else (200, 10_000, 100_000):
+        record(f"append_history[{entries}]", bench_append_history(entries, 3 if entries > 10_000 else 7))
+    for orders in (1_000, 10_000) if quick else (1_000, 10_000, 100_000):
+        results = bench_known_orders(orders, 9 if orders < 100_000 else 3)
+        record(f"known_orders[{orders} cold]", results["cold"])
+        record(f"known_orders[{orders} warm]", results["warm"])
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "recorded": datetime.now(UTC).isoformat(),
+        "quick": quick,
+        "calibration_seconds": calibration,
+        "cases": cases,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> bool:
+    """Print each case against the baseline; return False on any regression."""
+    ok = True
+    for name, case in results["cases"].items():
+        reference: Optional[Dict] = baseline["cases"].get(name)
+        if not reference:
+            print(f"{name:<44} {'new':>10}")
+            continue
+        if min(case["seconds"], reference["seconds"]) < MIN_COMPARED_SECONDS:
+            print(f"{name:<44} {'-':>10}  too short to compare")
+            continue
+        ratio = case["normalized"] / reference["normalized"]
+        regressed = ratio > 1 + tolerance
+        ok = ok and not regressed
+        print(f"{name:<44} {ratio:>9.2f}x  {'REGRESSION' if regressed else 'ok'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="skip the 100k-entry cases")
+    parser.add_argument("--baseline", default=BASELINE, help=f"baseline file (default: {BASELINE})")
+    parser.add_argument("--output", default=RESULTS, help=f"results file (default: {RESULTS})")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="print the comparison but exit zero on a regression (for shared CI runners)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed slowdown of a normalized median before it counts as a regression",
+    )
+    args = parser.parse_args()
+
+    results = run(args.quick)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+        handle.write("\n")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+            handle.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return
+    print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+    if not compare(results, baseline, args.tolerance) and not args.report_only:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Compare the single-pass text scanner with the original per-pattern scans.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_text_scanner [--articles 200] [--paragraphs 400]
+
+The legacy implementation below is the pre-scanner `_parse_expiration` plus
+three separate phrase searches, kept verbatim so both sides classify the
+same synthetic proclamation pages.
+"""
+
+import argparse
+import re
+import time
+from datetime import datetime, timedelta
+
+from src.api.check_status import (
+    EASTERN,
+    HALF_STAFF_TERMS,
+    NATIONAL_ORDER_TERMS,
+    ORDER_TERMS,
+    UTC,
+    FlagStatusChecker,
+    scan_text,
+)
+
+NOW = datetime(2026, 7, 12, 18, 0, tzinfo=UTC)
+FILLER = (
+    "By the authority vested in me as President by the Constitution and the laws "
+    "of the United States of America, we honor the service of those who came "
+    "before us and recommit ourselves to the ideals they defended. "
+)
+ORDER = (
+    "I hereby order that the flag of the United States shall be flown at "
+    "half-staff at the White House and upon all public buildings and grounds "
+    "throughout the United States until sunset, July 18, 2026."
+)
+
+
+def legacy_parse_expiration(text, base):
+    explicit_date = re.search(
+        r"until\s+(?:sunset\s*,?\s*(?:on\s+)?)?"
+        r"(january|february|march|april|may|june|july|august|september|"
+        r"october|november|december)\s+(\d{1,2})(?:,\s*(\d{4}))?",
+        text,
+        re.I,
+    )
+    if explicit_date:
+        month = datetime.strptime(explicit_date.group(1), "%B").month
+        year = int(explicit_date.group(3) or base.year)
+        end = datetime(year, month, int(explicit_date.group(2)), 23, 59, tzinfo=EASTERN)
+        return end.astimezone(UTC).isoformat()
+
+    time_then_date = re.search(
+        r"until\s+(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)\s+on\s+"
+        r"(january|february|march|april|may|june|july|august|september|"
+        r"october|november|december)\s+(\d{1,2})(?:,\s*(\d{4}))?",
+        text,
+        re.I,
+    )
+    if time_then_date:
+        hour = int(time_then_date.group(1))
+        if "p" in time_then_date.group(3).lower() and hour != 12:
+            hour += 12
+        if "a" in time_then_date.group(3).lower() and hour == 12:
+            hour = 0
+        month = datetime.strptime(time_then_date.group(4), "%B").month
+        year = int(time_then_date.group(6) or base.year)
+        end = datetime(
+            year, month, int(time_then_date.group(5)), hour,
+            int(time_then_date.group(2) or 0), tzinfo=EASTERN,
+        )
+        return end.astimezone(UTC).isoformat()
+
+    weekday_time = re.search(
+        r"until\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
+        r"(?:\s+(?:morning|afternoon|evening))?\s+at\s+"
+        r"(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)",
+        text,
+        re.I,
+    )
+    if weekday_time:
+        weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+        days_ahead = (weekdays.index(weekday_time.group(1).lower()) - base.weekday()) % 7 or 7
+        hour = int(weekday_time.group(2))
+        if "p" in weekday_time.group(4).lower() and hour != 12:
+            hour += 12
+        if "a" in weekday_time.group(4).lower() and hour == 12:
+            hour = 0
+        end = (base + timedelta(days=days_ahead)).replace(
+            hour=hour, minute=int(weekday_time.group(3) or 0), second=0, microsecond=0
+        )
+        return end.astimezone(UTC).isoformat()
+    return None
+
+
+def legacy_classify(text):
+    matched = bool(
+        HALF_STAFF_TERMS.search(text) and NATIONAL_ORDER_TERMS.search(text) and ORDER_TERMS.search(text)
+    )
+    return matched, legacy_parse_expiration(text, NOW.astimezone(EASTERN))
+
+
+def scanner_classify(checker, text):
+    scan = scan_text(text)
+    matched = scan["half_staff"] and scan["national"] and scan["order"]
+    return matched, checker._resolve_expiration(scan["expiration"])
+
+
+def pages(paragraphs):
+    """A proclamation with the order at the end and one with no order at all."""
+    body = FILLER * paragraphs
+    return {"order-at-end": body + ORDER, "no-order": body}
+
+
+def timed(function, texts, articles):
+    started = time.perf_counter()
+    for _ in range(articles):
+        for text in texts:
+            function(text)
+    return (time.perf_counter() - started) / (articles * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=400)
+    args = parser.parse_args()
+
+    checker = FlagStatusChecker(now=NOW)
+    for name, text in pages(args.paragraphs).items():
+        assert legacy_classify(text) == scanner_classify(checker, text), name
+        legacy = timed(legacy_classify, [text], args.articles)
+        scanner = timed(lambda value: scanner_classify(checker, value), [text], args.articles)
+        print(
+            f"{name:>13} ({len(text) / 1024:.0f} KiB): legacy {legacy * 1000:.3f} ms, "
+            f"scanner {scanner * 1000:.3f} ms per article ({legacy / scanner:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
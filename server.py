@@ -7,15 +7,53 @@ directly, so this script is NOT required for day-to-day frontend work.
 Use it only when you want a *dynamic* backend to prototype against (e.g.
 random status changes, manual overrides, pagination) instead of static
 fixture files.
+
+With `--sources DIR` it instead impersonates the upstream sources the
+checker reads (HalfStaff.org, White House pages, Bing News RSS) from
+recorded fixtures, with injectable latency and faults, so end-to-end runs
+can be benchmarked offline and reproducibly:
+
+    python3 server.py 8001 --sources fixtures/ --latency lognormal:120:0.5 \
+        --error-rate 0.05 --timeout-rate 0.02 --truncate-rate 0.02 --seed 7
+    python3 src/api/check_status.py --sources-base http://localhost:8001
+
+DIR uses the replay capture layout (see src/api/replay.py): an `index.json`
+mapping recorded URLs to files, or a directory of such captures, of which
+the newest is served.
+
+With `--artifacts DIR` (normally `public`) it serves the real published
+artifacts (`api/status.json`, `api/history.json`, `badge.json` and the rest
+of `api/`) from memory, re-reading a file only when its mtime changes, on a
+threaded keep-alive server suitable for running behind a load balancer.
+`/api/events` there is a Server-Sent Events stream that pushes `status` and
+`history` events only when the published status or change feed changes.
+
+Both the mock and artifact modes answer `/api/history/query`, which filters
+the history by `status`, `source`, `verification`, `order_id` and a
+`from`/`to` date range, `limit` entries at a time; each page's
+`next_cursor` is passed back as `cursor` for the next one.
 """
 
+import argparse
+import asyncio
+import bisect
+import gzip
+import hashlib
 import json
+import math
 import os
-import sys
-from datetime import datetime, timedelta
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
 import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse, urlsplit
+
+try:
+    import brotli
+except ImportError:  # optional: br is then served only from precompressed .br files
+    brotli = None
 
 # Mock data for development
 MOCK_FLAG_STATUS = {
@@ -47,8 +85,253 @@ MOCK_HISTORY = [
     for i in range(30)
 ]
 
+# Bumped whenever MOCK_FLAG_STATUS changes, so cached encodings go stale.
+MOCK_VERSION = 0
+
+# ---------------------------------------------------------------------------
+# Encoded responses: pre-serialized bodies, ETags and content negotiation
+# ---------------------------------------------------------------------------
+
+CACHE_CONTROL = 'public, max-age=60, must-revalidate'
+CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type'),
+)
+# Below this size compression saves less than the Content-Encoding header costs.
+MIN_COMPRESS_BYTES = 256
+# Levels for bodies not compressed at publish time: compressed on the request
+# path, so quick settings win over the last few percent of size.
+RUNTIME_GZIP_LEVEL = 6
+RUNTIME_BROTLI_QUALITY = 5
+
+
+def parse_accept_encoding(header):
+    """Map each content coding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for item in (header or '').split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class EncodedResponse:
+    """A response body with its strong ETag and compressed variants.
+
+    `variants` may supply bodies compressed at publish time (the `.gz`/`.br`
+    files next to an artifact). Any other coding is compressed on the first
+    request that asks for it, at a cheap level, and kept; only requests
+    waiting for that same coding of this body wait on it. br is offered when
+    precompressed or when the optional brotli module is installed. Each
+    coding gets its own strong ETag, since the bytes on the wire differ.
+    """
+
+    def __init__(self, body, last_modified=None, variants=None):
+        self.body = body
+        self.last_modified = last_modified
+        self.tag = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {'identity': body}
+        self.codings = ('identity',)
+        if len(body) >= MIN_COMPRESS_BYTES:
+            self.variants.update(variants or {})
+            offered = ('br', 'gzip') if brotli is not None or 'br' in self.variants else ('gzip',)
+            self.codings = offered + ('identity',)
+        self._lock = threading.Lock()
+
+    def etag(self, coding='identity'):
+        return f'"{self.tag}"' if coding == 'identity' else f'"{self.tag}-{coding}"'
+
+    def negotiate(self, accept_encoding):
+        """The smallest variant the client accepts, by coding name."""
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get('*', 0.0)
+        for coding in self.codings[:-1]:
+            if accepted.get(coding, wildcard) > 0:
+                return coding
+        return 'identity'
+
+    def variant(self, coding):
+        """The body in `coding`, compressing (once) if it was not precompressed."""
+        encoded = self.variants.get(coding)
+        if encoded is None:
+            with self._lock:
+                encoded = self.variants.get(coding)
+                if encoded is None:
+                    if coding == 'br':
+                        encoded = brotli.compress(self.body, quality=RUNTIME_BROTLI_QUALITY)
+                    else:
+                        encoded = gzip.compress(self.body, compresslevel=RUNTIME_GZIP_LEVEL, mtime=0)
+                    self.variants[coding] = encoded
+        return encoded
+
+    def matches(self, if_none_match):
+        """Whether an If-None-Match header names this version (weak comparison)."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip() for tag in if_none_match.split(',')}
+        if '*' in tags:
+            return True
+        tags = {tag[2:] if tag.startswith('W/') else tag for tag in tags}
+        return any(self.etag(coding) in tags for coding in self.codings)
+
+
+def send_encoded(handler, response, head=False, extra_headers=()):
+    """Send `response` negotiated for the request, or a bodiless 304."""
+    coding = response.negotiate(handler.headers.get('Accept-Encoding'))
+    not_modified = response.matches(handler.headers.get('If-None-Match'))
+
+    handler.send_response(304 if not_modified else 200)
+    handler.send_header('ETag', response.etag(coding))
+    if response.last_modified is not None:
+        handler.send_header('Last-Modified', formatdate(response.last_modified, usegmt=True))
+    handler.send_header('Cache-Control', CACHE_CONTROL)
+    handler.send_header('Vary', 'Accept-Encoding')
+    for name, value in extra_headers:
+        handler.send_header(name, value)
+    if not_modified:
+        handler.end_headers()
+        return
+    body = response.variant(coding)
+    handler.send_header('Content-Type', 'application/json')
+    handler.send_header('Content-Length', str(len(body)))
+    if coding != 'identity':
+        handler.send_header('Content-Encoding', coding)
+    handler.end_headers()
+    if not head:
+        handler.wfile.write(body)
+
+
+# ---------------------------------------------------------------------------
+# History queries (/api/history/query)
+# ---------------------------------------------------------------------------
+
+# Query parameter -> history entry field; the entry's `id` is the order id.
+HISTORY_FIELDS = {
+    'status': 'status',
+    'source': 'source',
+    'verification': 'verification',
+    'order_id': 'id',
+}
+HISTORY_QUERY_LIMIT = 100
+
+
+def history_instant(value):
+    """Epoch seconds for an entry date or query bound; naive values are UTC."""
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def parse_history_query(query):
+    """Turn a query string into `HistoryIndex.query` arguments; ValueError if invalid."""
+    params = dict(parse_qsl(query))
+    arguments = {'filters': {name: params[name] for name in HISTORY_FIELDS if params.get(name)}}
+    for name, key in (('from', 'since'), ('to', 'until')):
+        if params.get(name):
+            instant = history_instant(params[name])
+            if instant is None:
+                raise ValueError(f'{name} must be an ISO 8601 date or timestamp')
+            if name == 'to' and len(params[name]) == 10:
+                instant += 86400 - 1e-6  # a bare `to` date includes that whole day
+            arguments[key] = instant
+    try:
+        arguments['limit'] = int(params.get('limit', 20))
+        arguments['cursor'] = int(params['cursor']) if params.get('cursor') else None
+    except ValueError:
+        raise ValueError('limit and cursor must be integers')
+    if not 1 <= arguments['limit'] <= HISTORY_QUERY_LIMIT:
+        raise ValueError(f'limit must be between 1 and {HISTORY_QUERY_LIMIT}')
+    return arguments
+
+
+class HistoryIndex:
+    """History entries indexed by date and by each filterable field.
+
+    Entries are held oldest first, so appending newer entries never moves
+    an older one: a cursor (the position of the last entry a page returned)
+    stays valid when the history is reloaded. Each field maps its values to
+    ascending positions; a query walks the shortest list that applies,
+    bisected to the date range, rather than every entry.
+    """
+
+    def __init__(self, entries):
+        """`entries` newest first, as published."""
+        timed = [(history_instant(entry.get('date')), entry) for entry in reversed(entries)]
+        timed = [(float('-inf') if instant is None else instant, entry) for instant, entry in timed]
+        timed.sort(key=lambda item: item[0])  # stable: same-instant entries keep log order
+        self.instants = [instant for instant, _ in timed]
+        self.entries = [entry for _, entry in timed]
+        self.postings = {name: {} for name in HISTORY_FIELDS}
+        for position, entry in enumerate(self.entries):
+            for name, field in HISTORY_FIELDS.items():
+                if entry.get(field) is not None:
+                    self.postings[name].setdefault(str(entry[field]).casefold(), []).append(position)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def query(self, filters=None, since=None, until=None, cursor=None, limit=20):
+        """Matching entries newest first, and the cursor for the next page (or None)."""
+        low = 0 if since is None else bisect.bisect_left(self.instants, since)
+        high = len(self.entries) if until is None else bisect.bisect_right(self.instants, until)
+        if cursor is not None:
+            high = min(high, max(cursor, 0))
+
+        wanted = [(HISTORY_FIELDS[name], str(value).casefold()) for name, value in (filters or {}).items()]
+        # Walk the shortest applicable list: all positions in the date range, or
+        # a field's postings narrowed to it (by index, without copying).
+        candidates, start, end = range(len(self.entries)), low, high
+        for name, value in (filters or {}).items():
+            postings = self.postings[name].get(str(value).casefold(), [])
+            first, last = bisect.bisect_left(postings, low), bisect.bisect_left(postings, high)
+            if last - first < end - start:
+                candidates, start, end = postings, first, last
+
+        matches = []
+        for offset in range(end - 1, start - 1, -1):
+            position = candidates[offset]
+            entry = self.entries[position]
+            if all(str(entry.get(field)).casefold() == value for field, value in wanted):
+                matches.append(position)
+                if len(matches) > limit:
+                    break
+        next_cursor = matches[limit - 1] if len(matches) > limit else None
+        return [self.entries[position] for position in matches[:limit]], next_cursor
+
+    def page(self, arguments):
+        """The JSON body for one query page."""
+        entries, next_cursor = self.query(**arguments)
+        return {
+            'history': entries,
+            'count': len(entries),
+            'next_cursor': None if next_cursor is None else str(next_cursor),
+            'total_entries': len(self.entries),
+        }
+
+
+MOCK_HISTORY_INDEX = HistoryIndex(MOCK_HISTORY)
+
+
 class FlagStatusHandler(SimpleHTTPRequestHandler):
     """Custom handler for Flag Status Monitor development server"""
+
+    # Encoded responses by data version, shared by all requests
+    encoded = {}
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=os.getcwd(), **kwargs)
@@ -63,6 +346,8 @@ class FlagStatusHandler(SimpleHTTPRequestHandler):
             self.handle_status_api()
         elif path in ('/api/history', '/api/history.json'):
             self.handle_history_api()
+        elif path == '/api/history/query':
+            self.handle_history_query()
         elif path == '/api/health':
             self.handle_health_api()
         else:
@@ -85,18 +370,15 @@ class FlagStatusHandler(SimpleHTTPRequestHandler):
         """Handle /api/status endpoint"""
         try:
             # Simulate occasional half-staff status
-            if random.random() < 0.1:  # 10% chance
-                status_data = MOCK_FLAG_STATUS.copy()
+            half_staff = random.random() < 0.1  # 10% chance
+            status_data = MOCK_FLAG_STATUS.copy()
+            if half_staff:
                 status_data.update({
                     "status": "half-staff",
-                    "reason": "Memorial observance",
-                    "last_updated": datetime.now().isoformat()
+                    "reason": "Memorial observance"
                 })
-            else:
-                status_data = MOCK_FLAG_STATUS.copy()
-                status_data["last_updated"] = datetime.now().isoformat()
-            
-            self.send_json_response(status_data)
+
+            self.send_json_response(status_data, version=('status', MOCK_VERSION, half_staff))
             
         except Exception as e:
             self.send_error_response(500, f"Internal server error: {str(e)}")
@@ -127,11 +409,24 @@ class FlagStatusHandler(SimpleHTTPRequestHandler):
                 }
             }
             
-            self.send_json_response(response_data)
+            self.send_json_response(response_data, version=('history', page, limit))
             
         except Exception as e:
             self.send_error_response(500, f"Internal server error: {str(e)}")
     
+    def handle_history_query(self):
+        """Handle /api/history/query endpoint"""
+        query = urlparse(self.path).query
+        try:
+            arguments = parse_history_query(query)
+        except ValueError as e:
+            self.send_error_response(400, str(e))
+            return
+        self.send_json_response(
+            MOCK_HISTORY_INDEX.page(arguments),
+            version=('history-query', tuple(sorted(parse_qsl(query))))
+        )
+
     def handle_health_api(self):
         """Handle /api/health endpoint"""
         health_data = {
@@ -158,7 +453,8 @@ class FlagStatusHandler(SimpleHTTPRequestHandler):
                 
                 # Validate override data
                 if 'status' in data and data['status'] in ['full-staff', 'half-staff']:
-                    global MOCK_FLAG_STATUS
+                    global MOCK_FLAG_STATUS, MOCK_VERSION
+                    MOCK_VERSION += 1
                     MOCK_FLAG_STATUS.update({
                         "status": data['status'],
                         "reason": data.get('reason', 'Manual override'),
@@ -181,20 +477,32 @@ class FlagStatusHandler(SimpleHTTPRequestHandler):
         except Exception as e:
             self.send_error_response(500, f"Internal server error: {str(e)}")
     
-    def send_json_response(self, data, status_code=200):
-        """Send JSON response with proper headers"""
-        response_json = json.dumps(data, indent=2)
-        
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Content-Length', str(len(response_json)))
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Cache-Control', 'no-cache')
-        self.end_headers()
-        
-        self.wfile.write(response_json.encode('utf-8'))
+    def send_json_response(self, data, status_code=200, version=None):
+        """Send JSON response with proper headers
+
+        Successful responses are encoded once per data `version` and carry an
+        ETag, so repeat polls are answered with 304 Not Modified.
+        """
+        if status_code != 200:
+            body = json.dumps(data, indent=2).encode('utf-8')
+            self.send_response(status_code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in CORS_HEADERS:
+                self.send_header(name, value)
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        response = self.encoded.get(version) if version else None
+        if response is None:
+            response = EncodedResponse(json.dumps(data, indent=2).encode('utf-8'))
+            if version:
+                if len(self.encoded) >= 256:
+                    self.encoded.clear()
+                self.encoded[version] = response
+        send_encoded(self, response, extra_headers=CORS_HEADERS)
     
     def send_error_response(self, status_code, message):
         """Send error response"""
@@ -218,19 +526,778 @@ class FlagStatusHandler(SimpleHTTPRequestHandler):
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         print(f"[{timestamp}] {format % args}")
 
+# ---------------------------------------------------------------------------
+# Upstream source simulator (--sources)
+# ---------------------------------------------------------------------------
+
+FIXTURE_TYPES = {
+    '.json': 'application/json',
+    '.xml': 'application/rss+xml; charset=utf-8',
+    '.rss': 'application/rss+xml; charset=utf-8',
+    '.html': 'text/html; charset=utf-8',
+}
+
+
+def fixture_key(path, query):
+    """Path plus query with parameters sorted, so equivalent URLs match."""
+    if not query:
+        return path
+    return f"{path}?{urlencode(sorted(parse_qsl(query, keep_blank_values=True)))}"
+
+
+class SourceFixtures:
+    """Recorded upstream responses, looked up by path and query."""
+
+    def __init__(self, directory):
+        if not os.path.exists(os.path.join(directory, 'index.json')):
+            captures = sorted(
+                name for name in os.listdir(directory)
+                if os.path.exists(os.path.join(directory, name, 'index.json'))
+            )
+            if not captures:
+                raise ValueError(f"No index.json in {directory} or its sub-directories")
+            directory = os.path.join(directory, captures[-1])
+        self.directory = directory
+        with open(os.path.join(directory, 'index.json'), encoding='utf-8') as handle:
+            index = json.load(handle)
+
+        self.origins = set()
+        self.responses = {}
+        for url, name in index.items():
+            parts = urlsplit(url)
+            self.origins.add(f"{parts.scheme}://{parts.netloc}")
+            with open(os.path.join(directory, name), 'rb') as handle:
+                body = handle.read()
+            content_type = FIXTURE_TYPES.get(os.path.splitext(name)[1], 'application/octet-stream')
+            self.responses[fixture_key(parts.path, parts.query)] = (body, content_type)
+
+    def lookup(self, request_path, origin):
+        """Return `(body, content_type)` with recorded origins pointed at `origin`."""
+        parts = urlsplit(request_path)
+        found = self.responses.get(fixture_key(parts.path, parts.query))
+        if found is None:
+            return None
+        body, content_type = found
+        if not content_type.startswith('application/octet-stream'):
+            for recorded in self.origins:
+                body = body.replace(recorded.encode(), origin.encode())
+        return body, content_type
+
+
+def parse_latency(spec):
+    """Turn `fixed:MS`, `uniform:LOW:HIGH`, `normal:MEAN:SD`, `exp:MEAN` or
+    `lognormal:MEDIAN:SIGMA` (all in milliseconds) into a sampler of seconds."""
+    kind, *values = spec.split(':')
+    try:
+        numbers = [float(value) for value in values]
+        samplers = {
+            'fixed': lambda rng: numbers[0],
+            'uniform': lambda rng: rng.uniform(numbers[0], numbers[1]),
+            'normal': lambda rng: rng.gauss(numbers[0], numbers[1]),
+            'exp': lambda rng: rng.expovariate(1 / numbers[0]),
+            'lognormal': lambda rng: rng.lognormvariate(math.log(numbers[0]), numbers[1]),
+        }
+        sampler = samplers[kind]
+        sampler(random.Random(0))
+    except (KeyError, IndexError, ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid latency spec: {spec}")
+    return lambda rng: max(0.0, sampler(rng)) / 1000
+
+
+class FaultProfile:
+    """Seeded latency and fault draws shared by every simulator request."""
+
+    def __init__(self, latency='fixed:0', error_rate=0.0, timeout_rate=0.0,
+                 truncate_rate=0.0, hang_seconds=30.0, etags=True, seed=None):
+        self.latency = parse_latency(latency)
+        self.rates = (('timeout', timeout_rate), ('error', error_rate), ('truncate', truncate_rate))
+        self.hang_seconds = hang_seconds
+        self.etags = etags
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """Return `(delay_seconds, fault)`, where fault is None or a fault name."""
+        with self._lock:
+            delay = self.latency(self._random)
+            roll = self._random.random()
+            status = self._random.choice((500, 502, 503))
+        for fault, rate in self.rates:
+            if roll < rate:
+                return delay, (fault, status)
+            roll -= rate
+        return delay, None
+
+
+class SourceSimulatorHandler(BaseHTTPRequestHandler):
+    """Serves recorded upstream responses with injected latency and faults."""
+
+    protocol_version = 'HTTP/1.1'
+    fixtures = None
+    faults = None
+    stats = None
+    stats_lock = None
+
+    def _count(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+
+    def do_GET(self):
+        if self.path == '/__simulator/stats':
+            with self.stats_lock:
+                body = json.dumps(self.stats).encode('utf-8')
+            self._send(200, body, 'application/json')
+            return
+
+        with self.stats_lock:
+            self.stats['requests'] = self.stats.get('requests', 0) + 1
+            self.stats['in_flight'] = self.stats.get('in_flight', 0) + 1
+            self.stats['max_in_flight'] = max(self.stats.get('max_in_flight', 0), self.stats['in_flight'])
+        try:
+            self._respond()
+        finally:
+            self._count('in_flight', -1)
+
+    def _respond(self):
+        delay, fault = self.faults.draw()
+        time.sleep(delay)
+        if fault and fault[0] == 'timeout':
+            # Accept the request but never answer it.
+            self._count('timeouts')
+            time.sleep(self.faults.hang_seconds)
+            self.close_connection = True
+            return
+        if fault and fault[0] == 'error':
+            self._count('errors')
+            self._send(fault[1], b'upstream error', 'text/plain')
+            return
+
+        found = self.fixtures.lookup(self.path, f"http://{self.headers.get('Host', 'localhost')}")
+        if found is None:
+            self._count('not_found')
+            self._send(404, b'not recorded', 'text/plain')
+            return
+        body, content_type = found
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"' if self.faults.etags else None
+        if etag and self.headers.get('If-None-Match') == etag:
+            self._count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if fault and fault[0] == 'truncate':
+            # Promise the full body, send half of it and hang up.
+            self._count('truncated')
+            self._send(200, body, content_type, etag, length=len(body) // 2)
+            self.close_connection = True
+            return
+        self._send(200, body, content_type, etag)
+
+    def _send(self, status_code, body, content_type, etag=None, length=None):
+        self.send_response(status_code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body[:length])
+
+    def log_message(self, format, *args):
+        """Per-request logging is left to /__simulator/stats."""
+
+
+def make_source_simulator(address, fixtures, faults):
+    """Build a threaded server impersonating the upstream sources."""
+    handler = type('ConfiguredSourceSimulator', (SourceSimulatorHandler,), {
+        'fixtures': fixtures,
+        'faults': faults,
+        'stats': {},
+        'stats_lock': threading.Lock(),
+    })
+    server = ThreadingHTTPServer(address, handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve_sources(port, args):
+    """Run the upstream source simulator until interrupted."""
+    fixtures = SourceFixtures(args.sources)
+    faults = FaultProfile(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        truncate_rate=args.truncate_rate,
+        hang_seconds=args.hang,
+        etags=not args.no_etags,
+        seed=args.seed,
+    )
+    httpd = make_source_simulator(('', port), fixtures, faults)
+    print(f"""
+🇺🇸 Flag Status Monitor — Upstream Source Simulator
+====================================================
+Serving {len(fixtures.responses)} recorded responses from {fixtures.directory}
+at http://localhost:{port} (latency {args.latency}, errors {args.error_rate:.0%},
+timeouts {args.timeout_rate:.0%}, truncated {args.truncate_rate:.0%}).
+
+Point the checker at it:
+  python3 src/api/check_status.py --sources-base http://localhost:{port}
+Request and fault counts: http://localhost:{port}/__simulator/stats
+Press Ctrl+C to stop the server
+""")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n\nShutting down server...")
+        httpd.server_close()
+        print("Server stopped.")
+
+
+# ---------------------------------------------------------------------------
+# Published artifact serving (--artifacts)
+# ---------------------------------------------------------------------------
+
+ARTIFACT_ALIASES = {
+    '/api/status': 'api/status.json',
+    '/api/history': 'api/history.json',
+    '/badge': 'badge.json',
+}
+
+
+def artifact_path(request_path):
+    """Map a request path to a file under the artifact root, or None."""
+    path = ARTIFACT_ALIASES.get(request_path, request_path.lstrip('/'))
+    parts = path.split('/')
+    if '..' in parts or '' in parts or not path.endswith('.json'):
+        return None
+    if path != 'badge.json' and parts[0] != 'api':
+        return None
+    return path
+
+
+# Precompressed siblings written by ArtifactWriter(precompress=True)
+ARTIFACT_SIBLINGS = (('gzip', '.gz'), ('br', '.br'))
+
+
+class Artifact:
+    """One file encoded as last read, with the stats it was read at."""
+
+    def __init__(self, response, signature):
+        self.response = response
+        self.signature = signature
+        self.checked = time.monotonic()
+
+    @property
+    def body(self):
+        return self.response.body
+
+
+class ArtifactStore:
+    """Published artifacts held in memory, reloaded when their mtime changes.
+
+    A file (and its `.gz`/`.br` siblings) is stat()ed at most once per
+    `recheck` seconds; between checks every request is answered from memory.
+    The checker replaces files by atomic rename, so a reload never sees a
+    half-written file. A sibling is used only if it matches the JSON it
+    sits next to; otherwise that encoding is produced in memory.
+    """
+
+    def __init__(self, root, recheck=1.0):
+        self.root = os.path.abspath(root)
+        self.recheck = recheck
+        self.reloads = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Return the current `Artifact` for `path`, or None if it does not exist."""
+        entry = self._entries.get(path)
+        if entry and time.monotonic() - entry.checked < self.recheck:
+            return entry
+        filename = os.path.join(self.root, path)
+        signature = self._signature(filename)
+        if signature is None:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+        if entry and entry.signature == signature:
+            entry.checked = time.monotonic()
+            return entry
+        # Read outside the lock, so one slow artifact does not hold up the rest.
+        loaded = Artifact(self._load(filename, signature), signature)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry.signature == signature:
+                return entry
+            self._entries[path] = loaded
+            self.reloads += 1
+        return loaded
+
+    @staticmethod
+    def _signature(filename):
+        """(mtime_ns, size) of the file and each sibling, or None if it is missing."""
+        signature = []
+        for suffix in ('',) + tuple(suffix for _, suffix in ARTIFACT_SIBLINGS):
+            try:
+                stat = os.stat(filename + suffix)
+            except OSError:
+                if not suffix:
+                    return None
+                signature.append(None)
+                continue
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    @staticmethod
+    def _load(filename, signature):
+        with open(filename, 'rb') as handle:
+            body = handle.read()
+        variants = {}
+        for (coding, suffix), stat in zip(ARTIFACT_SIBLINGS, signature[1:]):
+            # Siblings are written after the JSON; an older one is stale.
+            if stat is None or stat[0] < signature[0][0]:
+                continue
+            try:
+                with open(filename + suffix, 'rb') as handle:
+                    encoded = handle.read()
+                if coding == 'gzip' and gzip.decompress(encoded) != body:
+                    continue
+                if coding == 'br' and brotli is not None and brotli.decompress(encoded) != body:
+                    continue
+            except Exception:  # unreadable or corrupt sibling (OSError, gzip/brotli errors)
+                continue
+            variants[coding] = encoded
+        return EncodedResponse(body, signature[0][0] / 1e9, variants)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# ---------------------------------------------------------------------------
+# Status event stream (/api/events)
+# ---------------------------------------------------------------------------
+
+# The fields that make up the resolved status; last_checked and the source
+# metrics change every run without the status itself changing.
+RESOLVED_FIELDS = ('status', 'reason', 'source', 'source_url', 'expires', 'verification', 'order_id')
+# A subscriber this far behind is not reading; it is dropped, and resumes on reconnect.
+MAX_SUBSCRIBER_BUFFER = 256 * 1024
+
+
+def format_event(event, data, event_id):
+    """One SSE frame; `data` is serialized to a single line of JSON."""
+    payload = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+    return f'id: {event_id}\nevent: {event}\ndata: {payload}\n\n'.encode('utf-8')
+
+
+def parse_event_id(value):
+    """Split a `<cursor>:<digest>` event id; anything else resumes from scratch."""
+    cursor, _, digest = (value or '').strip().partition(':')
+    try:
+        return int(cursor), digest or None
+    except ValueError:
+        return None, None
+
+
+class EventState:
+    """What subscribers have been told: the change feed cursor and status digest."""
+
+    def __init__(self, status=None, cursor=0, segment_size=0):
+        self.status = status
+        self.cursor = cursor
+        self.segment_size = segment_size
+        resolved = {field: status.get(field) for field in RESOLVED_FIELDS} if status else None
+        self.digest = (
+            hashlib.sha256(json.dumps(resolved, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+            if resolved else ''
+        )
+
+
+class _Subscriber(asyncio.Protocol):
+    def __init__(self, broker):
+        self.broker = broker
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        """Subscribers send nothing after their request; ignore anything that arrives."""
+
+    def connection_lost(self, exc):
+        self.broker.subscribers.discard(self.transport)
+
+
+class EventBroker:
+    """Pushes status and history events to SSE subscribers on one asyncio loop.
+
+    Request handling stays on the threaded server; an `/api/events` request
+    hands its socket over here, where an idle subscriber is only a
+    transport in a set. The published artifacts are polled through the
+    `ArtifactStore`, and each change is encoded once and written to every
+    subscriber. Event ids are `<change feed cursor>:<status digest>`, both
+    derived from the published files, so `Last-Event-ID` resumes correctly
+    across server restarts: missed `history` events are replayed from the
+    change feed, and a `status` event is sent only if the status differs.
+    """
+
+    def __init__(self, store, poll=1.0, heartbeat=15.0, retry_ms=5000):
+        self.store = store
+        self.poll = poll
+        self.heartbeat = heartbeat
+        self.retry_ms = retry_ms
+        self.subscribers = set()
+        self.state = EventState()
+        self.loop = None
+        self._thread = None
+        self._segments = {}
+
+    def start(self):
+        self.state = self._read_state()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name='event-broker', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.create_task(self._watch())
+        self.loop.create_task(self._beat())
+        self.loop.run_forever()
+
+    def close(self):
+        if self.loop and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+            self._thread.join(timeout=5)
+            self.loop.close()
+
+    async def _shutdown(self):
+        for transport in list(self.subscribers):
+            transport.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
+    def attach(self, sock, last_event_id=None):
+        """Take over an accepted socket whose SSE response headers are sent."""
+        future = asyncio.run_coroutine_threadsafe(self._attach(sock, last_event_id), self.loop)
+        future.result(timeout=5)
+
+    async def _attach(self, sock, last_event_id):
+        transport, _ = await self.loop.connect_accepted_socket(lambda: _Subscriber(self), sock)
+        # No await from here on: the backlog and the subscription are one step,
+        # so a broadcast cannot slip in between them.
+        cursor, digest = parse_event_id(last_event_id)
+        state = self.state
+        frames = [f'retry: {self.retry_ms}\n\n'.encode('ascii')]
+        if digest != state.digest and state.status:
+            # Until the replayed history is through, the client's cursor still stands.
+            resumed = state.cursor if cursor is None else min(cursor, state.cursor)
+            frames.append(format_event('status', state.status, f'{resumed}:{state.digest}'))
+        if cursor is not None:
+            frames += self._history_frames(cursor, state)
+        transport.write(b''.join(frames))
+        self.subscribers.add(transport)
+
+    def _read_state(self):
+        status = self.store.get('api/status.json')
+        head = self.store.get('api/changes/head.json')
+        try:
+            status = json.loads(status.body) if status else None
+            head = json.loads(head.body) if head else {}
+        except ValueError:  # a file mid-replacement outside the checker's atomic writes
+            return self.state
+        return EventState(status, head.get('cursor', 0), head.get('segment_size', 0))
+
+    def _changes(self, start):
+        """The changes in the feed segment starting at `start`, parsed once per version."""
+        artifact = self.store.get(f'api/changes/{start}.json')
+        if artifact is None:
+            return []
+        cached = self._segments.get(start)
+        if cached is None or cached[0] is not artifact:
+            try:
+                cached = (artifact, json.loads(artifact.body).get('changes', []))
+            except ValueError:
+                return []
+            self._segments[start] = cached
+        return cached[1]
+
+    def _history_frames(self, after, state):
+        """`history` events for change feed entries with seq in (after, state.cursor]."""
+        if after >= state.cursor or not state.segment_size:
+            return []
+        size = state.segment_size
+        frames = []
+        for start in range(max(after, 0) // size * size + 1, state.cursor + 1, size):
+            for change in self._changes(start):
+                if after < change['seq'] <= state.cursor:
+                    frames.append(format_event('history', change, f"{change['seq']}:{state.digest}"))
+        return frames
+
+    def _broadcast(self, payload):
+        for transport in list(self.subscribers):
+            if transport.get_write_buffer_size() > MAX_SUBSCRIBER_BUFFER:
+                self.subscribers.discard(transport)
+                transport.abort()
+            else:
+                transport.write(payload)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll)
+            state = await self.loop.run_in_executor(None, self._read_state)
+            previous = self.state
+            if state.digest == previous.digest and state.cursor <= previous.cursor:
+                continue
+            frames = []
+            if state.digest != previous.digest and state.status:
+                frames.append(format_event('status', state.status, f'{previous.cursor}:{state.digest}'))
+            frames += await self.loop.run_in_executor(None, self._history_frames, previous.cursor, state)
+            self.state = state
+            if frames:
+                self._broadcast(b''.join(frames))
+
+    async def _beat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            self._broadcast(b': heartbeat\n\n')
+
+
+class HistoryQueries:
+    """Queries over the full published history, indexed once per version.
+
+    The history is read from the `history/` page shards when they are
+    published, else from history.json alone. Pages are read straight from
+    disk, not through the store, and the index is rebuilt only when the
+    shard index (written after the pages) or history.json changes. Each
+    distinct query's response is kept until then; it is built outside the
+    lock and compressed only if a client asks for it.
+    """
+
+    def __init__(self, store, max_responses=1024):
+        self.store = store
+        self.max_responses = max_responses
+        self.index = HistoryIndex([])
+        self._identity = None
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        shards = self.store.get('api/history/index.json')
+        source = shards if shards is not None else self.store.get('api/history.json')
+        identity = source and (source is shards, source.signature)
+        if identity == self._identity:
+            return
+        entries = []
+        if source is shards:
+            for page in reversed(json.loads(shards.body).get('pages', [])):  # pages count up from the oldest
+                with open(os.path.join(self.store.root, 'api', page['path']), 'rb') as handle:
+                    entries += json.load(handle).get('history', [])
+        elif source is not None:
+            entries = json.loads(source.body).get('history', [])
+        self.index = HistoryIndex(entries)
+        self._identity = identity
+        self._responses = {}
+
+    def response(self, query):
+        """The `EncodedResponse` for a query string; ValueError if it is invalid."""
+        arguments = parse_history_query(query)
+        key = tuple(sorted(parse_qsl(query)))
+        with self._lock:
+            try:
+                self._refresh()
+            except (OSError, ValueError):  # a shard mid-replacement; keep answering from the last index
+                pass
+            index, responses = self.index, self._responses
+        response = responses.get(key)
+        if response is None:
+            body = json.dumps(index.page(arguments), separators=(',', ':')).encode('utf-8')
+            response = EncodedResponse(body)
+            with self._lock:
+                if responses is self._responses:
+                    if len(responses) >= self.max_responses:
+                        responses = self._responses = {}
+                    responses[key] = response
+        return response
+
+
+class ArtifactHandler(BaseHTTPRequestHandler):
+    """Serves published artifacts from an `ArtifactStore` over keep-alive HTTP/1.1."""
+
+    protocol_version = 'HTTP/1.1'
+    store = None
+    events = None
+    history = None
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/api/events' and self.events is not None:
+            self._subscribe()
+            return
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def _serve(self, head):
+        path = urlparse(self.path).path
+        if path == '/api/health':
+            status = self.store.get('api/status.json')
+            body = json.dumps({
+                'status': 'healthy' if status else 'degraded',
+                'artifacts_loaded': len(self.store),
+                'reloads': self.store.reloads,
+                'subscribers': len(self.events.subscribers) if self.events else 0,
+            }).encode('utf-8')
+            self._send(200 if status else 503, body, head)
+            return
+
+        if path == '/api/history/query':
+            try:
+                response = self.history.response(urlparse(self.path).query)
+            except ValueError as error:
+                self._send(400, json.dumps({'error': True, 'message': str(error)}).encode('utf-8'), head)
+                return
+            send_encoded(self, response, head, extra_headers=CORS_HEADERS[:1])
+            return
+
+        relative = artifact_path(path)
+        artifact = self.store.get(relative) if relative else None
+        if artifact is None:
+            self._send(404, json.dumps({'error': True, 'message': 'Not Found'}).encode('utf-8'), head)
+            return
+        send_encoded(self, artifact.response, head, extra_headers=CORS_HEADERS[:1])
+
+    def _subscribe(self):
+        """Answer with an event stream and hand the connection to the broker."""
+        query = dict(parse_qsl(urlparse(self.path).query))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        self.server.detach(self.request)
+        # EventSource sends Last-Event-ID itself; the query parameter is for clients that cannot.
+        self.events.attach(self.request, self.headers.get('Last-Event-ID') or query.get('lastEventId'))
+
+    def _send(self, status_code, body, head):
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Per-request logging is left to the load balancer."""
+
+
+class ArtifactServer(ThreadingHTTPServer):
+    """A threaded server that leaves connections handed to the event broker open."""
+
+    daemon_threads = True
+    # Subscribers reconnect in a burst after a restart; the default backlog of 5 drops them.
+    request_queue_size = 1024
+
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self._detached = set()
+        self._detached_lock = threading.Lock()
+
+    def detach(self, request):
+        with self._detached_lock:
+            self._detached.add(request)
+
+    def shutdown_request(self, request):
+        with self._detached_lock:
+            if request in self._detached:
+                self._detached.discard(request)
+                return
+        super().shutdown_request(request)
+
+
+def make_artifact_server(address, store, events=None):
+    """Build a threaded server answering from `store`, with `/api/events` if given a broker."""
+    handler = type(
+        'ConfiguredArtifactHandler',
+        (ArtifactHandler,),
+        {'store': store, 'events': events, 'history': HistoryQueries(store)},
+    )
+    return ArtifactServer(address, handler)
+
+
+def serve_artifacts(port, args):
+    """Serve the published artifacts until interrupted."""
+    store = ArtifactStore(args.artifacts)
+    events = EventBroker(store, heartbeat=args.heartbeat)
+    events.start()
+    httpd = make_artifact_server(('', port), store, events)
+    print(f"""
+🇺🇸 Flag Status Monitor — Artifact Server
+==========================================
+Serving {store.root} from memory at http://localhost:{port}
+  - GET  /api/status.json, /api/history.json, /badge.json, /api/**.json
+  - GET  /api/events          - Server-Sent Events on status changes
+  - GET  /api/history/query   - Filtered history with cursor pagination
+  - GET  /api/health
+Press Ctrl+C to stop the server
+""")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n\nShutting down server...")
+        events.close()
+        httpd.server_close()
+        print("Server stopped.")
+
+
 def main():
     """Main server function"""
+    parser = argparse.ArgumentParser(description='Flag Status Monitor mock API server.')
+    parser.add_argument('port', nargs='?', default='8000', help='port to listen on (default: 8000)')
+    parser.add_argument('--artifacts', metavar='DIR',
+                        help='serve the real published artifacts under DIR (e.g. public) from memory')
+    parser.add_argument('--heartbeat', type=float, default=15.0,
+                        help='seconds between keep-alive comments on /api/events (default: 15)')
+    simulator = parser.add_argument_group('upstream source simulator')
+    simulator.add_argument('--sources', metavar='DIR', help='serve recorded upstream fixtures from DIR')
+    simulator.add_argument('--latency', default='fixed:0',
+                           help='fixed:MS, uniform:LOW:HIGH, normal:MEAN:SD, exp:MEAN or lognormal:MEDIAN:SIGMA')
+    simulator.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered 5xx')
+    simulator.add_argument('--timeout-rate', type=float, default=0.0, help='share of requests never answered')
+    simulator.add_argument('--truncate-rate', type=float, default=0.0, help='share of bodies cut off halfway')
+    simulator.add_argument('--hang', type=float, default=30.0, help='seconds a timed-out request is held')
+    simulator.add_argument('--no-etags', action='store_true', help='never answer 304 Not Modified')
+    simulator.add_argument('--seed', type=int, help='seed for reproducible latency and faults')
+    args = parser.parse_args()
+
     port = 8000
-    
-    # Check if port is specified as command line argument
-    if len(sys.argv) > 1:
+    try:
+        port = int(args.port)
+    except ValueError:
+        print("Invalid port number. Using default port 8000.")
+
+    if args.artifacts:
+        serve_artifacts(port, args)
+        return
+
+    if args.sources:
         try:
-            port = int(sys.argv[1])
-        except ValueError:
-            print("Invalid port number. Using default port 8000.")
-    
+            parse_latency(args.latency)
+        except ValueError as error:
+            parser.error(str(error))
+        serve_sources(port, args)
+        return
+
     server_address = ('', port)
-    httpd = HTTPServer(server_address, FlagStatusHandler)
+    httpd = ThreadingHTTPServer(server_address, FlagStatusHandler)
     
     print(f"""
 🇺🇸 Flag Status Monitor — Mock API Server
@@ -239,6 +1306,7 @@ Server running at: http://localhost:{port}
 API endpoints:
   - GET  /api/status.json     - Current flag status (randomized)
   - GET  /api/history.json    - Flag status history
+  - GET  /api/history/query   - Filtered history with cursor pagination
   - GET  /api/health          - Server health check
   - POST /api/status/override - Manual status override
 
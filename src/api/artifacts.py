@@ -0,0 +1,143 @@
+"""Content-addressed writer for the published JSON artifacts.
+
+Artifacts are rendered to their canonical bytes in memory and hashed. A
+file is replaced (atomically, via a temporary file and rename) only when its
+hash differs from the one recorded in the manifest, so unchanged runs touch
+nothing on disk and the deploy/commit steps see exactly what changed.
+
+Frequently polled artifacts can also get precompressed `.gz` and `.br`
+siblings. Both encoders are deterministic (no timestamps or file names), so
+unchanged JSON always yields byte-identical compressed files.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, List
+
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are skipped without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+def render_json(data) -> bytes:
+    """The canonical, minified serialization every artifact is written in."""
+    return (json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def compressed_variants(content: bytes) -> Dict[str, bytes]:
+    """Deterministic precompressed encodings of `content`, keyed by suffix."""
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    return variants
+
+
+def atomic_write(path: str, content: bytes) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # A unique temporary file, so concurrent writers (threads included) never share one.
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(content)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+class ArtifactWriter:
+    def __init__(self, manifest_file: str):
+        self.manifest_file = manifest_file
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self.written: List[str] = []
+        self.sizes: Dict[str, Dict[str, int]] = {}
+        try:
+            with open(manifest_file, encoding="utf-8") as handle:
+                self._manifest: Dict[str, Dict] = json.load(handle).get("artifacts", {})
+        except (OSError, json.JSONDecodeError):
+            self._manifest = {}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normpath(path).replace(os.sep, "/")
+
+    def write(self, path: str, data, precompress: bool = False) -> bool:
+        """Write `data` as JSON, plus `.gz`/`.br` siblings when `precompress`."""
+        content = render_json(data)
+        changed = self.write_bytes(path, content)
+        if precompress:
+            sizes = {"json": len(content)}
+            for suffix, encoded in compressed_variants(content).items():
+                changed = self.write_bytes(path + suffix, encoded) or changed
+                sizes[suffix[1:]] = len(encoded)
+            with self._lock:
+                self.sizes[self._key(path)] = sizes
+        return changed
+
+    def write_bytes(self, path: str, content: bytes) -> bool:
+        """Write `content` to `path` unless it is already there; report whether it was."""
+        key = self._key(path)
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            known = self._manifest.get(key)
+        if known and known["sha256"] == digest and os.path.exists(path):
+            return False
+
+        unchanged = False
+        if not known:
+            # First sight of this file (e.g. no manifest yet): compare bytes
+            # on disk once rather than rewriting an identical file.
+            try:
+                with open(path, "rb") as handle:
+                    unchanged = handle.read() == content
+            except OSError:
+                pass
+        if not unchanged:
+            atomic_write(path, content)
+
+        with self._lock:
+            self._manifest[key] = {"sha256": digest, "bytes": len(content)}
+            self._dirty = True
+            if not unchanged:
+                self.written.append(key)
+        return not unchanged
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            if self._manifest.pop(self._key(path), None) is not None:
+                self._dirty = True
+        if os.path.exists(path):
+            os.remove(path)
+
+    def save(self) -> bool:
+        """Persist the manifest if any entry changed.
+
+        Saves are serialized, so a later snapshot is never overwritten by an
+        earlier one (the daemon's compactor saves from its own thread).
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return False
+                manifest = {"artifacts": dict(sorted(self._manifest.items()))}
+                self._dirty = False
+            try:
+                atomic_write(self.manifest_file, render_json(manifest))
+            except BaseException:
+                with self._lock:
+                    self._dirty = True
+                raise
+            return True
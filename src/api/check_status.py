@@ -7,21 +7,47 @@ checks active verified orders, White House actions, and fresh national-order
 news before publishing full-staff.
 """
 
+import argparse
+import bisect
+import hashlib
+import io
+import itertools
 import json
 import logging
 import os
 import re
+import signal
+import threading
+import time
 import urllib.parse
 import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
-from typing import Dict, List, Optional
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 import requests
 from bs4 import BeautifulSoup
 
+try:  # imported as src.api.check_status (tests and tooling)
+    from .artifacts import ArtifactWriter
+    from .history_log import HistoryLog
+    from .http_cache import HttpCache
+    from .http_session import HttpSession
+    from .jurisdictions import JURISDICTIONS, mentioned_jurisdictions
+    from .metrics import export as export_metrics
+    from .status_store import StatusStore
+except ImportError:  # executed directly as src/api/check_status.py
+    from artifacts import ArtifactWriter
+    from history_log import HistoryLog
+    from http_cache import HttpCache
+    from http_session import HttpSession
+    from jurisdictions import JURISDICTIONS, mentioned_jurisdictions
+    from metrics import export as export_metrics
+    from status_store import StatusStore
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -38,6 +64,136 @@ NATIONAL_ORDER_TERMS = re.compile(
 )
 ORDER_TERMS = re.compile(r"\b(?:order(?:s|ed|ing)?|direct(?:s|ed|ing)?)\b", re.I)
 
+MONTHS = {
+    name: index
+    for index, name in enumerate(
+        (
+            "january",
+            "february",
+            "march",
+            "april",
+            "may",
+            "june",
+            "july",
+            "august",
+            "september",
+            "october",
+            "november",
+            "december",
+        ),
+        start=1,
+    )
+}
+WEEKDAYS = {
+    name: index
+    for index, name in enumerate(
+        ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+    )
+}
+_MONTH = "(?:" + "|".join(MONTHS) + ")"
+_MERIDIEM = r"(?:a\.?m\.?|p\.?m\.?)"
+# One scanner over lowercased text finds the three qualifying phrases (the
+# same wording as the *_TERMS patterns above) and every supported expiration
+# form in a single pass. Each alternative starts with a distinct literal so
+# the regex engine can skip straight to candidate characters; the `\b` that
+# would otherwise lead a pattern is checked by a lookbehind instead.
+TEXT_SCANNER = re.compile(
+    r"h(?<=\bh)(?P<half_staff>alf[\s-]?(?:staff|mast)\b)"
+    r"|a(?P<all_flags>ll\s+(?:american\s+flags|flags\s+(?:in|across)\s+(?:the\s+)?u\.?s\.?))"
+    r"|t(?P<throughout>hroughout\s+the\s+united\s+states)"
+    r"|n(?P<nationwide>ationwide)"
+    r"|o(?<=\bo)(?P<order>rder(?:s|ed|ing)?\b)"
+    r"|d(?<=\bd)(?P<direct>irect(?:s|ed|ing)?\b)"
+    r"|u(?P<until>ntil\s+(?:"
+    rf"(?:sunset\s*,?\s*(?:on\s+)?)?(?P<d_month>{_MONTH})\s+(?P<d_day>\d{{1,2}})"
+    r"(?:,\s*(?P<d_year>\d{4}))?"
+    rf"|(?P<t_hour>\d{{1,2}})(?::(?P<t_minute>\d{{2}}))?\s*(?P<t_meridiem>{_MERIDIEM})\s+on\s+"
+    rf"(?P<t_month>{_MONTH})\s+(?P<t_day>\d{{1,2}})(?:,\s*(?P<t_year>\d{{4}}))?"
+    r"|(?P<w_day>" + "|".join(WEEKDAYS) + r")(?:\s+(?:morning|afternoon|evening))?\s+at\s+"
+    rf"(?P<w_hour>\d{{1,2}})(?::(?P<w_minute>\d{{2}}))?\s*(?P<w_meridiem>{_MERIDIEM})"
+    r"))"
+)
+SCANNER_PHRASES = {
+    "half_staff": "half_staff",
+    "all_flags": "national",
+    "throughout": "national",
+    "nationwide": "national",
+    "order": "order",
+    "direct": "order",
+}
+# Expiration forms in the order they take precedence when several appear.
+EXPIRATION_FORMS = ("d_month", "t_hour", "w_day")
+
+
+def scan_text(text: str) -> Dict:
+    """Find qualifying phrases and the first match of each expiration form."""
+    found = {"half_staff": False, "national": False, "order": False}
+    expirations: Dict[str, Dict] = {}
+    for match in TEXT_SCANNER.finditer(text.lower()):
+        kind = match.lastgroup
+        if kind in SCANNER_PHRASES:
+            found[SCANNER_PHRASES[kind]] = True
+        else:
+            form = next(form for form in EXPIRATION_FORMS if match.group(form))
+            expirations.setdefault(form, match.groupdict())
+        if all(found.values()) and EXPIRATION_FORMS[0] in expirations:
+            break
+    form = next((form for form in EXPIRATION_FORMS if form in expirations), None)
+    found["expiration"] = expirations[form] if form else None
+    return found
+
+
+# A conservative raw-byte pre-filter for HALF_STAFF_TERMS: "half" and
+# "staff"/"mast" separated by any run of whitespace, hyphens, entities
+# (`&#45;`, `&ensp;`), tags (`</p><p>`) or non-ASCII bytes (UTF-8 spaces
+# and dashes). It may match pages the text scan rejects, never the reverse.
+HALF_STAFF_BYTES = re.compile(rb"half(?:[\s\x80-\xff-]|&[#\w]+;|<[^>]*>)*(?:staff|mast)", re.I)
+
+
+class TextExtractor(HTMLParser):
+    """Collect visible text without building a document tree.
+
+    Matches `BeautifulSoup(...).get_text(" ", strip=True)`: script, style and
+    template contents are skipped and each stripped string is space-joined.
+    """
+
+    SKIPPED = {"script", "style", "template"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: List[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED:
+            self._skipping += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED and self._skipping:
+            self._skipping -= 1
+
+    def handle_data(self, data):
+        if not self._skipping:
+            data = data.strip()
+            if data:
+                self._parts.append(data)
+
+    @classmethod
+    def extract(cls, html: str) -> str:
+        parser = cls()
+        parser.feed(html)
+        parser.close()
+        return " ".join(parser._parts)
+
+
+def _hour_24(hour: str, meridiem: str) -> int:
+    value = int(hour)
+    if "p" in meridiem and value != 12:
+        value += 12
+    if "a" in meridiem and value == 12:
+        value = 0
+    return value
+
 
 def parse_datetime(value: Optional[str]) -> Optional[datetime]:
     if not value:
@@ -55,27 +211,212 @@ def direct_news_url(url: str) -> str:
     return query.get("url", [url])[0]
 
 
+# Per-source measurements in checked_sources that vary from run to run.
+SOURCE_METRICS = ("seconds", "requests", "bytes", "statuses", "repeat_fetches", "cache", "items")
+
+
+def _without_metrics(sources: Optional[List[Dict]]) -> Optional[List[Dict]]:
+    if sources is None:
+        return None
+    return [
+        {key: value for key, value in source.items() if key not in SOURCE_METRICS}
+        for source in sources
+    ]
+
+
+_UNREAD = object()
+
+
+class KnownOrderIndex:
+    """Known orders sorted by start time, answering "active at T" by bisection.
+
+    Indexes are cached per path and rebuilt only when the registry file's
+    mtime changes *and* its content hash differs from the cached build.
+    Orders listing `jurisdictions` (state codes) are state-only: they are
+    left out of the federal index and found through `for_jurisdiction`.
+    """
+
+    _cache: Dict[str, "KnownOrderIndex"] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, orders: List[Dict], jurisdiction: Optional[str] = None):
+        self._registry = orders
+        self._jurisdictions: Dict[str, "KnownOrderIndex"] = {}
+        entries = []
+        for position, order in enumerate(orders):
+            scope = order.get("jurisdictions") or ()
+            if (jurisdiction not in scope) if jurisdiction else scope:
+                continue
+            starts = parse_datetime(order.get("starts"))
+            expires = parse_datetime(order.get("expires"))
+            if starts and expires:
+                # Among equal starts, the first listed order wins, as max() did.
+                entries.append((starts, -position, expires, order))
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        self._starts = [entry[0] for entry in entries]
+        self._expires = [entry[2] for entry in entries]
+        self._orders = [entry[3] for entry in entries]
+        # Latest expiry among orders up to each position. Once it falls at or
+        # before T, no earlier-starting order can still be active.
+        self._reach = list(itertools.accumulate(self._expires, max))
+        self.mtime_ns: Optional[int] = None
+        self.digest: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def entries(self) -> Iterator[Tuple[Dict, datetime, datetime]]:
+        return zip(self._orders, self._starts, self._expires)
+
+    def for_jurisdiction(self, code: str) -> "KnownOrderIndex":
+        """The index of state-only orders covering `code`, built on first use."""
+        if code not in self._jurisdictions:
+            self._jurisdictions[code] = KnownOrderIndex(self._registry, code)
+        return self._jurisdictions[code]
+
+    def active_at(self, moment: datetime) -> Optional[Dict]:
+        """Return the latest-starting order active at `moment`, if any."""
+        for position in range(bisect.bisect_right(self._starts, moment) - 1, -1, -1):
+            if self._reach[position] <= moment:
+                break
+            if self._expires[position] > moment:
+                return self._orders[position]
+        return None
+
+    @classmethod
+    def load(cls, path: str) -> "KnownOrderIndex":
+        """Return the cached index for `path`, rebuilding it if the file changed."""
+        mtime_ns = os.stat(path).st_mtime_ns
+        with cls._cache_lock:
+            cached = cls._cache.get(path)
+        if cached and cached.mtime_ns == mtime_ns:
+            return cached
+
+        with open(path, "rb") as handle:
+            raw = handle.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached and cached.digest == digest:
+            cached.mtime_ns = mtime_ns
+            return cached
+
+        index = cls(json.loads(raw).get("orders", []))
+        index.mtime_ns, index.digest = mtime_ns, digest
+        with cls._cache_lock:
+            cls._cache[path] = index
+        return index
+
+
 class FlagStatusChecker:
-    def __init__(self, now: Optional[datetime] = None):
+    def __init__(self, now: Optional[datetime] = None, http: Optional[HttpSession] = None):
         self.now = (now or datetime.now(UTC)).astimezone(UTC)
         self.api_status_file = os.path.join("public", "api", "status.json")
         self.history_file = os.path.join("public", "api", "history.json")
         self.badge_file = os.path.join("public", "badge.json")
+        self.artifacts = ArtifactWriter(os.path.join("public", "api", "manifest.json"))
+        # Optional SQLite store; the JSON files above become exports of it.
+        self.store: Optional[StatusStore] = None
+        self.source_signals: Dict[str, Dict] = {}
+        self._existing_status = _UNREAD
         self.known_orders_file = os.path.join("src", "api", "known_orders.json")
+        # Working state that speeds up later runs but is never published.
+        self.cache_dir = os.path.join(".cache", "flag-status")
+        self.article_memo_file = os.path.join(self.cache_dir, "articles.json")
+        self.max_article_memo_entries = 500
+        # Listing links already classified are skipped unless their recorded
+        # expiry is still ahead or the verdict is older than this.
+        self.max_whitehouse_links = 40
+        self.article_recheck_after = timedelta(days=1)
+        self._articles: Optional[Dict[str, Dict]] = None
+        self._articles_dirty = False
+        self._memo_lock = threading.Lock()
+        # Per-run source metrics: published in checked_sources and exported
+        # as a Prometheus text file plus a rolling JSONL log.
+        self.metrics_dir = os.path.join(self.cache_dir, "metrics")
+        self.run_seconds = 0.0
+        self._source_items: Dict[str, Dict[str, int]] = {}
+        self._source_seconds: Dict[str, float] = {}
+        self._metrics_lock = threading.Lock()
         self.halfstaff_url = "https://halfstaff.org/wp-json/halfstaff/v1/widget"
         self.whitehouse_url = "https://www.whitehouse.gov/presidential-actions/proclamations/"
         self.news_url = "https://www.bing.com/news/search"
+        self.news_queries = (
+            "all American flags lowered half mast",
+            "all American flags lowered half staff",
+            "president orders all American flags lowered",
+        )
+        # Every transition is kept in the append-only log; history.json
+        # publishes the newest `max_history_entries` of them.
+        self.history_log = HistoryLog(os.path.join("src", "api", "history"))
         self.max_history_entries = 200
+        self.history_page_size = 50
+        self.change_segment_size = 100
+        self.background_compaction = False
+        self._compactor = ThreadPoolExecutor(max_workers=1)
+        # Per-state resolution (`--states`, or `--states-only` as its own
+        # step) publishes states/<code>.json and states/index.json. Its
+        # fetches run after the federal status is published, under their own
+        # budget, kept well inside the scheduled job's timeout.
+        self.include_states = False
+        self.state_deadline_seconds = 120.0
+        self.max_state_workers = 12
+        self.state_news_queries = (
+            "governor orders flags half staff",
+            "governor orders flags lowered half-mast",
+            "state flags half-staff honor governor",
+        )
+        # Every source shares one run-wide budget. A source that has not
+        # answered by then is reported late instead of delaying publication.
+        self.deadline_seconds = 45.0
+        self.deadline: Optional[float] = None
         self.headers = {
             "User-Agent": (
                 "FlagStatusMonitor/3.1 "
                 "(+https://github.com/jacob-booth/flag-status-monitor)"
             )
         }
+        # Pass a shared session to keep pooled connections warm across runs.
+        self.http = http or HttpSession(
+            self.headers,
+            connect_timeout=5.0,
+            read_timeout=15.0,
+            cache=HttpCache(os.path.join(self.cache_dir, "http")),
+        )
+
+    def use_output_root(self, root: str) -> None:
+        """Publish and keep working state under `root` instead of the repository.
+
+        The default layout is mirrored (`root/public/api`, `root/src/api/history`,
+        `root/.cache/flag-status`), so runs against simulated sources never
+        touch the real artifacts, the committed history log or the live caches.
+        The known-order registry is still read from its usual place.
+        """
+        self.api_status_file = os.path.join(root, "public", "api", "status.json")
+        self.history_file = os.path.join(root, "public", "api", "history.json")
+        self.badge_file = os.path.join(root, "public", "badge.json")
+        self.artifacts = ArtifactWriter(os.path.join(root, "public", "api", "manifest.json"))
+        self.history_log = HistoryLog(os.path.join(root, "src", "api", "history"))
+        self.cache_dir = os.path.join(root, ".cache", "flag-status")
+        self.article_memo_file = os.path.join(self.cache_dir, "articles.json")
+        self.metrics_dir = os.path.join(self.cache_dir, "metrics")
+        self._articles = None
+        self._existing_status = _UNREAD
+        if self.http.cache is not None:
+            self.http.cache = HttpCache(os.path.join(self.cache_dir, "http"))
+
+    def use_source_base(self, base: str) -> None:
+        """Send every source fetch to `base`, e.g. the server.py source simulator."""
+        for name in ("halfstaff_url", "whitehouse_url", "news_url"):
+            parts = urllib.parse.urlsplit(getattr(self, name))
+            setattr(self, name, base.rstrip("/") + urllib.parse.urlunsplit(("", "", parts.path, parts.query, "")))
+
+    def _remaining(self) -> float:
+        return float("inf") if self.deadline is None else self.deadline - time.monotonic()
 
     def _get(self, url: str, **kwargs):
-        headers = {**self.headers, **kwargs.pop("headers", {})}
-        response = requests.get(url, headers=headers, timeout=15, **kwargs)
+        remaining = self._remaining()
+        if remaining <= 0:
+            raise requests.Timeout(f"Run deadline passed before fetching {url}")
+        response = self.http.get(url, budget=remaining, **kwargs)
         response.raise_for_status()
         return response
 
@@ -101,16 +442,26 @@ class FlagStatusChecker:
             "order_id": order_id,
         }
 
+    def _count_items(self, source: str, kind: str, amount: int = 1) -> None:
+        with self._metrics_lock:
+            counts = self._source_items.setdefault(source, {})
+            counts[kind] = counts.get(kind, 0) + amount
+
     def _is_active(self, signal: Dict) -> bool:
         expires = parse_datetime(signal.get("expires"))
         return signal.get("status") == "half-staff" and (not expires or expires > self.now)
 
     def _read_existing_status(self) -> Optional[Dict]:
-        try:
-            with open(self.api_status_file, encoding="utf-8") as handle:
-                return json.load(handle)
-        except (OSError, json.JSONDecodeError):
-            return None
+        """Read the published status once per run, however many steps need it."""
+        if self._existing_status is _UNREAD and self.store:
+            self._existing_status = self.store.current_status() or _UNREAD
+        if self._existing_status is _UNREAD:
+            try:
+                with open(self.api_status_file, encoding="utf-8") as handle:
+                    self._existing_status = json.load(handle)
+            except (OSError, json.JSONDecodeError):
+                self._existing_status = None
+        return self._existing_status
 
     def check_known_orders(self) -> Optional[Dict]:
         """Read reviewed, time-bounded orders used to bridge provider lag.
@@ -120,23 +471,18 @@ class FlagStatusChecker:
         and third-party APIs update.
         """
         try:
-            with open(self.known_orders_file, encoding="utf-8") as handle:
-                orders = json.load(handle).get("orders", [])
+            index = KnownOrderIndex.load(self.known_orders_file)
         except (OSError, json.JSONDecodeError) as error:
             logger.warning("Known-order registry unavailable: %s", error)
             return None
 
-        active = []
-        for order in orders:
-            starts = parse_datetime(order.get("starts"))
-            expires = parse_datetime(order.get("expires"))
-            if starts and starts <= self.now and expires and expires > self.now:
-                active.append(order)
-
-        if not active:
+        if self.store:
+            self.store.sync_known_orders(index.entries(), index.digest)
+        self._count_items("known-orders", "orders", len(index))
+        order = index.active_at(self.now)
+        if not order:
             return None
 
-        order = max(active, key=lambda item: parse_datetime(item["starts"]))
         return self._signal(
             "half-staff",
             order["reason"],
@@ -150,17 +496,23 @@ class FlagStatusChecker:
             order_id=order.get("id"),
         )
 
-    def check_halfstaff_api(self) -> Optional[Dict]:
-        """Read HalfStaff.org, retaining `none` only as a negative signal."""
+    def check_halfstaff_api(self, state: Optional[str] = None) -> Optional[Dict]:
+        """Read HalfStaff.org, retaining `none` only as a negative signal.
+
+        With `state`, read the widget for that state instead of the federal one.
+        """
+        url = f"{self.halfstaff_url}?state={state}" if state else self.halfstaff_url
         try:
-            data = self._get(self.halfstaff_url).json()
+            data = self._get(url, source="halfstaff-org-states" if state else "halfstaff-org").json()
             notice_type = data.get("type")
+            if not state:
+                self._count_items("halfstaff-org", "notices", int(bool(notice_type) and notice_type != "none"))
             if notice_type and notice_type != "none":
                 return self._signal(
                     "half-staff",
                     data.get("title") or data.get("reason") or "Active half-staff notice",
                     "HalfStaff.org",
-                    self.halfstaff_url,
+                    url,
                     data.get("expires"),
                     priority=70,
                 )
@@ -168,93 +520,141 @@ class FlagStatusChecker:
                 "full-staff",
                 "No active notice reported by HalfStaff.org",
                 "HalfStaff.org",
-                self.halfstaff_url,
+                url,
                 priority=10,
                 verification="negative-provider-signal",
             )
         except (requests.RequestException, ValueError) as error:
-            logger.error("HalfStaff.org check failed: %s", error)
+            logger.error("HalfStaff.org check failed%s: %s", f" ({state})" if state else "", error)
             return None
 
     def _parse_expiration(self, text: str, published: Optional[datetime] = None) -> Optional[str]:
         """Extract common order expiration wording from a headline/body."""
+        return self._resolve_expiration(scan_text(text)["expiration"], published)
+
+    def _resolve_expiration(
+        self, groups: Optional[Dict], published: Optional[datetime] = None
+    ) -> Optional[str]:
+        """Turn a `scan_text` expiration match into a UTC timestamp."""
+        if not groups:
+            return None
         base = (published or self.now).astimezone(EASTERN)
 
-        explicit_date = re.search(
-            r"until\s+(?:sunset\s*,?\s*(?:on\s+)?)?"
-            r"(january|february|march|april|may|june|july|august|september|"
-            r"october|november|december)\s+(\d{1,2})(?:,\s*(\d{4}))?",
-            text,
-            re.I,
-        )
-        if explicit_date:
-            month = datetime.strptime(explicit_date.group(1), "%B").month
-            year = int(explicit_date.group(3) or base.year)
-            end = datetime(year, month, int(explicit_date.group(2)), 23, 59, tzinfo=EASTERN)
+        if groups["d_month"]:
+            year = int(groups["d_year"] or base.year)
+            month = MONTHS[groups["d_month"]]
+            end = datetime(year, month, int(groups["d_day"]), 23, 59, tzinfo=EASTERN)
             return end.astimezone(UTC).isoformat()
 
-        time_then_date = re.search(
-            r"until\s+(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)\s+on\s+"
-            r"(january|february|march|april|may|june|july|august|september|"
-            r"october|november|december)\s+(\d{1,2})(?:,\s*(\d{4}))?",
-            text,
-            re.I,
-        )
-        if time_then_date:
-            hour = int(time_then_date.group(1))
-            if "p" in time_then_date.group(3).lower() and hour != 12:
-                hour += 12
-            if "a" in time_then_date.group(3).lower() and hour == 12:
-                hour = 0
-            month = datetime.strptime(time_then_date.group(4), "%B").month
-            year = int(time_then_date.group(6) or base.year)
+        if groups["t_hour"]:
             end = datetime(
-                year,
-                month,
-                int(time_then_date.group(5)),
-                hour,
-                int(time_then_date.group(2) or 0),
+                int(groups["t_year"] or base.year),
+                MONTHS[groups["t_month"]],
+                int(groups["t_day"]),
+                _hour_24(groups["t_hour"], groups["t_meridiem"]),
+                int(groups["t_minute"] or 0),
                 tzinfo=EASTERN,
             )
             return end.astimezone(UTC).isoformat()
 
-        weekday_time = re.search(
-            r"until\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
-            r"(?:\s+(?:morning|afternoon|evening))?\s+at\s+"
-            r"(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)",
-            text,
-            re.I,
+        days_ahead = (WEEKDAYS[groups["w_day"]] - base.weekday()) % 7
+        if days_ahead == 0:
+            days_ahead = 7
+        end = (base + timedelta(days=days_ahead)).replace(
+            hour=_hour_24(groups["w_hour"], groups["w_meridiem"]),
+            minute=int(groups["w_minute"] or 0),
+            second=0,
+            microsecond=0,
         )
-        if weekday_time:
-            weekdays = {
-                name: index
-                for index, name in enumerate(
-                    ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-                )
-            }
-            target = weekdays[weekday_time.group(1).lower()]
-            days_ahead = (target - base.weekday()) % 7
-            if days_ahead == 0:
-                days_ahead = 7
-            hour = int(weekday_time.group(2))
-            if "p" in weekday_time.group(4).lower() and hour != 12:
-                hour += 12
-            if "a" in weekday_time.group(4).lower() and hour == 12:
-                hour = 0
-            end = (base + timedelta(days=days_ahead)).replace(
-                hour=hour,
-                minute=int(weekday_time.group(3) or 0),
-                second=0,
-                microsecond=0,
-            )
-            return end.astimezone(UTC).isoformat()
-
-        return None
+        return end.astimezone(UTC).isoformat()
 
     def _reason_from_text(self, text: str) -> str:
         match = re.search(r"\bto honor\s+(.+?)(?:\s*[|–—-]\s*|$)", text, re.I)
         return f"Honoring {match.group(1).strip()}" if match else "Presidential half-staff order"
 
+    def _news_feed(self, query: str, source: str = "breaking-news") -> Optional[bytes]:
+        try:
+            return self._get(
+                self.news_url,
+                params={"q": query, "format": "rss"},
+                source=source,
+            ).content
+        except requests.RequestException as error:
+            logger.error("Breaking-order news query failed (%s): %s", query, error)
+            return None
+
+    def _fresh_feed_items(self, content: bytes) -> Iterator[Dict]:
+        """Stream RSS items, dropping each one as soon as its pubDate is stale."""
+        item = None
+        for event, element in ET.iterparse(io.BytesIO(content), events=("start", "end")):
+            if event == "start":
+                if element.tag == "item":
+                    item = {
+                        "title": "",
+                        "link": "",
+                        "guid": None,
+                        "description": "",
+                        "published": None,
+                    }
+                continue
+            if item is None:
+                continue
+            if element.tag == "item":
+                if item["published"]:
+                    yield item
+                item = None
+                element.clear()
+            elif item.get("stale"):
+                continue
+            elif element.tag in ("title", "link", "guid", "description"):
+                item[element.tag] = (element.text or "").strip()
+            elif element.tag == "pubDate":
+                try:
+                    published = parsedate_to_datetime(element.text).astimezone(UTC)
+                except (TypeError, ValueError):
+                    item["stale"] = True
+                    continue
+                if self.now - published > timedelta(days=3) or published > self.now + timedelta(
+                    hours=1
+                ):
+                    item["stale"] = True
+                else:
+                    item["published"] = published
+
+    def _news_candidates(self) -> Iterator[Dict]:
+        """Yield fresh, de-duplicated headlines that pass all three safeguards.
+
+        Feeds are parsed as each query returns. An item repeated across
+        queries (same GUID, or same unwrapped link) is only scanned once.
+        """
+        seen = set()
+        with ThreadPoolExecutor(max_workers=len(self.news_queries)) as pool:
+            futures = {pool.submit(self._news_feed, query): query for query in self.news_queries}
+            for future in as_completed(futures):
+                content = future.result()
+                if content is None:
+                    continue
+                try:
+                    for item in self._fresh_feed_items(content):
+                        item["link"] = direct_news_url(item["link"])
+                        if self._seen_before(seen, item["guid"], item["link"]):
+                            continue
+                        self._count_items("breaking-news", "items")
+                        scan = scan_text(item["title"])
+                        if scan["half_staff"] and scan["national"] and scan["order"]:
+                            self._count_items("breaking-news", "matches")
+                            yield {**item, "scan": scan}
+                except ET.ParseError as error:
+                    logger.error("Breaking-order news feed unreadable (%s): %s", futures[future], error)
+
+    @staticmethod
+    def _seen_before(seen: set, guid: Optional[str], link: str) -> bool:
+        """Whether a feed item repeats one already seen by GUID or by link; records both."""
+        keys = {key for key in (guid, link) if key}
+        repeated = not seen.isdisjoint(keys)
+        seen.update(keys)
+        return repeated
+
     def check_news_orders(self) -> Optional[Dict]:
         """Detect breaking nationwide orders that provider APIs have missed.
 
@@ -264,38 +664,9 @@ class FlagStatusChecker:
         State-only notices cannot change the federal status.
         """
         candidates = []
-        items = []
-        queries = (
-            "all American flags lowered half mast",
-            "all American flags lowered half staff",
-            "president orders all American flags lowered",
-        )
-        for query in queries:
-            try:
-                response = self._get(
-                    self.news_url,
-                    params={"q": query, "format": "rss"},
-                )
-                items.extend(ET.fromstring(response.content).findall(".//item"))
-            except (requests.RequestException, ET.ParseError) as error:
-                logger.error("Breaking-order news query failed (%s): %s", query, error)
-
-        for item in items:
-            title = item.findtext("title", default="").strip()
-            try:
-                published = parsedate_to_datetime(item.findtext("pubDate")).astimezone(UTC)
-            except (TypeError, ValueError):
-                continue
-            if self.now - published > timedelta(days=3) or published > self.now + timedelta(hours=1):
-                continue
-            if not (
-                HALF_STAFF_TERMS.search(title)
-                and NATIONAL_ORDER_TERMS.search(title)
-                and ORDER_TERMS.search(title)
-            ):
-                continue
-
-            expires = self._parse_expiration(title, published)
+        for headline in self._news_candidates():
+            title, published = headline["title"], headline["published"]
+            expires = self._resolve_expiration(headline["scan"]["expiration"], published)
             # A headline without an end time is useful as an alert but unsafe
             # to publish indefinitely. Keep it active for 24 hours while each
             # subsequent run searches for a more precise order.
@@ -309,7 +680,7 @@ class FlagStatusChecker:
                     "half-staff",
                     self._reason_from_text(title),
                     f"Breaking order report: {title.rsplit(' - ', 1)[-1]}",
-                    direct_news_url(item.findtext("link", default="")),
+                    headline["link"],
                     expires,
                     priority=80,
                     verification="national-order-headline",
@@ -318,18 +689,71 @@ class FlagStatusChecker:
 
         return max(candidates, key=lambda signal: signal["expires"], default=None)
 
+    def _article_memo(self) -> Dict[str, Dict]:
+        with self._memo_lock:
+            if self._articles is None:
+                try:
+                    with open(self.article_memo_file, encoding="utf-8") as handle:
+                        self._articles = json.load(handle)
+                except (OSError, json.JSONDecodeError):
+                    self._articles = {}
+            return self._articles
+
+    def _save_article_memo(self) -> None:
+        with self._memo_lock:
+            if not self._articles_dirty:
+                return
+            # Keep the most recently classified articles; older proclamations
+            # have long dropped off the listing page.
+            entries = list(self._articles.items())[-self.max_article_memo_entries :]
+            self._articles = dict(entries)
+            self._articles_dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.article_memo_file), exist_ok=True)
+            with open(self.article_memo_file, "w", encoding="utf-8") as handle:
+                json.dump(self._articles, handle)
+        except OSError as error:
+            logger.warning("Article memo not saved: %s", error)
+
+    def _classify_article(self, text: str) -> Dict:
+        """Extract the clock-independent parts of an article's verdict."""
+        scan = scan_text(text)
+        entry = {key: scan[key] for key in ("half_staff", "national", "order")}
+        if entry["half_staff"] and entry["national"] and entry["order"]:
+            entry["reason"] = self._reason_from_text(text)
+            entry["expires"] = self._resolve_expiration(scan["expiration"])
+            # Expiration wording can be relative to the current date, so the
+            # matching text is kept and re-resolved against `self.now`.
+            entry["text"] = text
+        return entry
+
     def _whitehouse_article_signal(self, url: str) -> Optional[Dict]:
         try:
-            text = BeautifulSoup(self._get(url).text, "html.parser").get_text(" ", strip=True)
+            response = self._get(url, source="white-house")
         except requests.RequestException:
             return None
-        if not (
-            HALF_STAFF_TERMS.search(text)
-            and NATIONAL_ORDER_TERMS.search(text)
-            and ORDER_TERMS.search(text)
-        ):
+        digest = hashlib.sha256(response.content).hexdigest()
+        memo = self._article_memo()
+        entry = memo.get(url)
+        # A page ruled out by an older, narrower pre-filter is classified again.
+        stale = entry and entry.get("prefiltered") and HALF_STAFF_BYTES.search(response.content)
+        if not entry or entry.get("sha256") != digest or stale:
+            # Most proclamations never mention half-staff. A byte scan rules
+            # them out before any decoding or HTML parsing.
+            if HALF_STAFF_BYTES.search(response.content):
+                entry = self._classify_article(TextExtractor.extract(response.text))
+            else:
+                entry = {"half_staff": False, "prefiltered": True}
+            entry["sha256"] = digest
+        entry = {**entry, "classified": self.now.isoformat()}
+        with self._memo_lock:
+            memo.pop(url, None)
+            memo[url] = entry
+            self._articles_dirty = True
+
+        if "text" not in entry:
             return None
-        expires = self._parse_expiration(text)
+        expires = self._parse_expiration(entry["text"])
         # A historical proclamation can still contain the same order words.
         # Without a machine-readable future end time, it is not safe to call
         # that page an active order.
@@ -337,7 +761,7 @@ class FlagStatusChecker:
             return None
         return self._signal(
             "half-staff",
-            self._reason_from_text(text),
+            entry["reason"],
             "The White House",
             url,
             expires,
@@ -345,10 +769,22 @@ class FlagStatusChecker:
             verification="official-presidential-action",
         )
 
+    def _article_needs_fetch(self, entry: Optional[Dict]) -> bool:
+        """Fetch unseen articles, possibly active ones, and stale verdicts."""
+        if not entry:
+            return True
+        classified = parse_datetime(entry.get("classified"))
+        if not classified or self.now - classified > self.article_recheck_after:
+            return True
+        expires = parse_datetime(entry.get("expires"))
+        return bool(expires and expires > self.now)
+
     def check_whitehouse_actions(self) -> Optional[Dict]:
         """Scan the newest official proclamations for an active order."""
         try:
-            soup = BeautifulSoup(self._get(self.whitehouse_url).text, "html.parser")
+            soup = BeautifulSoup(
+                self._get(self.whitehouse_url, source="white-house").text, "html.parser"
+            )
         except requests.RequestException as error:
             logger.error("White House check failed: %s", error)
             return None
@@ -358,34 +794,100 @@ class FlagStatusChecker:
             url = urllib.parse.urljoin(self.whitehouse_url, anchor.get("href"))
             if url not in links:
                 links.append(url)
-            if len(links) >= 12:
+            if len(links) >= self.max_whitehouse_links:
                 break
 
+        memo = self._article_memo()
+        pending = [url for url in links if self._article_needs_fetch(memo.get(url))]
+        self._count_items("white-house", "links", len(links))
+        self._count_items("white-house", "articles", len(pending))
+        logger.info(
+            "White House listing: %d links, %d new or possibly active", len(links), len(pending)
+        )
         with ThreadPoolExecutor(max_workers=6) as pool:
-            signals = [signal for signal in pool.map(self._whitehouse_article_signal, links) if signal]
+            signals = [
+                signal for signal in pool.map(self._whitehouse_article_signal, pending) if signal
+            ]
         return max(signals, key=lambda signal: signal.get("expires") or "", default=None)
 
+    def _run_checks(self, checks) -> Tuple[List[Dict], List[Dict]]:
+        """Fan every source out concurrently under the run-wide deadline.
+
+        Sources that miss the deadline are marked late. Their pending fetches
+        see the expired deadline in `_get` and give up instead of starting.
+        """
+        self.http.reset_stats()
+        self._source_items, self._source_seconds = {}, {}
+        started = time.monotonic()
+        self.deadline = started + self.deadline_seconds
+        pool = ThreadPoolExecutor(max_workers=len(checks))
+        try:
+            futures = [(name, pool.submit(self._timed, name, check)) for name, check in checks]
+            done, _ = wait([future for _, future in futures], timeout=self.deadline_seconds)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.run_seconds = time.monotonic() - started
+
+        cache_stats = self.http.source_cache_stats()
+        http_stats = self.http.source_stats()
+        self.source_signals = {}
+        signals: List[Dict] = []
+        checked_sources = []
+        for name, future in futures:
+            if future not in done:
+                future.cancel()
+                logger.error("%s check missed the %.0fs run deadline", name, self.deadline_seconds)
+                source = {"name": name, "available": False, "late": True}
+            else:
+                signal = future.result()
+                source = {
+                    "name": name,
+                    "available": signal is not None,
+                    "seconds": round(self._source_seconds.get(name, 0.0), 3),
+                    **http_stats.get(name, {"requests": 0, "bytes": 0, "statuses": {}, "repeat_fetches": 0}),
+                    "items": self._source_items.get(name, {}),
+                }
+                if signal:
+                    signals.append(signal)
+                    self.source_signals[name] = dict(signal)
+            if name in cache_stats:
+                source["cache"] = cache_stats[name]
+            checked_sources.append(source)
+        return signals, checked_sources
+
+    def _timed(self, name: str, check):
+        started = time.monotonic()
+        try:
+            return check()
+        finally:
+            with self._metrics_lock:
+                self._source_seconds[name] = time.monotonic() - started
+
     def get_current_status(self) -> Dict:
         """Resolve positive signals before considering a full-staff signal."""
+        self._existing_status = _UNREAD
         checks = [
             ("known-orders", self.check_known_orders),
             ("white-house", self.check_whitehouse_actions),
             ("breaking-news", self.check_news_orders),
             ("halfstaff-org", self.check_halfstaff_api),
         ]
-        signals: List[Dict] = []
-        checked_sources = []
-        for name, check in checks:
-            signal = check()
-            checked_sources.append({"name": name, "available": signal is not None})
-            if signal:
-                signals.append(signal)
+        signals, checked_sources = self._run_checks(checks)
+        chosen = self._choose_signal(signals, self._read_existing_status)
+        chosen["last_checked"] = self.now.isoformat()
+        chosen["checked_sources"] = checked_sources
+        return chosen
+
+    def _choose_signal(self, signals: List[Dict], read_existing) -> Dict:
+        """Pick the winning signal, falling back to the published status.
 
+        `read_existing` is only called when no source reports an active order.
+        """
         active = [signal for signal in signals if self._is_active(signal)]
         if active:
             chosen = max(active, key=lambda signal: signal["priority"])
         else:
-            existing = self._read_existing_status()
+            existing = read_existing()
             if existing and self._is_active(existing):
                 chosen = {
                     **existing,
@@ -406,22 +908,91 @@ class FlagStatusChecker:
                     raise RuntimeError("No status source available; refusing to invent full-staff")
 
         chosen.pop("priority", None)
-        chosen["last_checked"] = self.now.isoformat()
-        chosen["checked_sources"] = checked_sources
         return chosen
 
-    def _append_history(self, status: Dict) -> None:
-        os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-        existing = {"history": []}
-        if os.path.exists(self.history_file):
+    def _write_json(self, path: str, data: Dict, precompress: bool = False) -> bool:
+        """Publish `data` through the content-addressed artifact writer."""
+        return self.artifacts.write(path, data, precompress=precompress)
+
+    def _seed_history_log(self) -> List[Dict]:
+        """Start the log from the published history.json on first use."""
+        try:
+            with open(self.history_file, encoding="utf-8") as handle:
+                published = json.load(handle).get("history", [])
+        except (json.JSONDecodeError, OSError) as error:
+            logger.warning("History unreadable, starting fresh: %s", error)
+            return []
+        return [self.history_log.append(entry, self.now) for entry in reversed(published)]
+
+    @property
+    def change_feed_dir(self) -> str:
+        return os.path.join(os.path.dirname(self.history_file), "changes")
+
+    def _publish_changes(self, records: List[Dict], previous_status: Optional[str] = None) -> None:
+        """Append history-log records to the static, cursor-based change feed.
+
+        `changes/head.json` holds the latest cursor (the log's `seq`). Changes
+        live in fixed-size segments named by their first sequence number, so
+        a client holding cursor N fetches `changes/{N // size * size + 1}.json`
+        and any later segments, and keeps changes with `seq > N`. Only the
+        newest segment ever grows; older ones never change.
+        """
+        if not records:
+            return
+        size = self.change_segment_size
+        segments: Dict[int, List[Dict]] = {}
+        for record in records:
+            status = record["entry"].get("status")
+            start = (record["seq"] - 1) // size * size + 1
+            segments.setdefault(start, []).append(
+                {
+                    "seq": record["seq"],
+                    "recorded": record["recorded"],
+                    "type": "update" if status == previous_status else "transition",
+                    "entry": record["entry"],
+                }
+            )
+            previous_status = status
+
+        for start, changes in segments.items():
+            path = os.path.join(self.change_feed_dir, f"{start}.json")
             try:
-                with open(self.history_file, encoding="utf-8") as handle:
-                    existing = json.load(handle)
-            except (json.JSONDecodeError, OSError) as error:
-                logger.warning("History unreadable, starting fresh: %s", error)
+                with open(path, encoding="utf-8") as handle:
+                    existing = json.load(handle).get("changes", [])
+            except (OSError, json.JSONDecodeError):
+                existing = []
+            known = {change["seq"] for change in existing}
+            self._write_json(
+                path,
+                {
+                    "from": start,
+                    "to": start + size - 1,
+                    "changes": existing + [change for change in changes if change["seq"] not in known],
+                },
+            )
 
-        history = existing.get("history", [])
-        last_entry = history[0] if history else None
+        latest = records[-1]
+        self._write_json(
+            os.path.join(self.change_feed_dir, "head.json"),
+            {
+                "cursor": latest["seq"],
+                "updated": latest["recorded"],
+                "segment_size": size,
+                "latest": f"changes/{max(segments)}.json",
+            },
+        )
+
+    def _append_history(self, status: Dict) -> None:
+        """Record a transition or enrichment; an unchanged run writes nothing."""
+        seeded = False
+        if not self.history_log.tail() and os.path.exists(self.history_file):
+            self._publish_changes(self._seed_history_log())
+            seeded = True
+        if self.store:
+            self._backfill_store()
+
+        tail = self.history_log.tail()
+        last_entry = tail["entry"] if tail else None
         history_entry = {
             "id": status.get("order_id"),
             "date": status["last_updated"],
@@ -434,19 +1005,60 @@ class FlagStatusChecker:
         }
         history_entry = {key: value for key, value in history_entry.items() if value is not None}
 
-        if not last_entry or last_entry.get("status") != status.get("status"):
-            history.insert(
-                0,
-                history_entry,
-            )
-        else:
+        if last_entry and last_entry.get("status") == status.get("status"):
             # Enrich the existing transition when a stronger source appears;
             # do not manufacture a second event or move its original date.
-            history[0] = {**last_entry, **history_entry, "date": last_entry["date"]}
+            history_entry = {**last_entry, **history_entry, "date": last_entry["date"]}
+            if history_entry == last_entry:
+                history_entry = None
+
+        if history_entry:
+            record = self.history_log.append(history_entry, self.now)
+            if self.store:
+                self.store.record_history([record])
+            self._publish_changes([record], last_entry.get("status") if last_entry else None)
+        elif not seeded:
+            return
+        if self.background_compaction:
+            self._compactor.submit(self._compact_history).add_done_callback(self._compaction_done)
+        else:
+            self._compact_history()
+
+    @staticmethod
+    def _compaction_done(future) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.error("Background history compaction failed: %s", error, exc_info=error)
+
+    def _backfill_store(self) -> None:
+        """Copy log records the store has not seen yet (e.g. a new database)."""
+        tail = self.history_log.tail()
+        known = self.store.history_seq()
+        if tail and tail["seq"] > known:
+            self.store.record_history(
+                record for record in self.history_log.records() if record["seq"] > known
+            )
+
+    def _history_view(self) -> List[Dict]:
+        """The full, de-duplicated, newest-first history."""
+        if self.store:
+            return self.store.history()
+
+        history: List[Dict] = []
+        for record in self.history_log.records():
+            entry = record["entry"]
+            if (
+                history
+                and history[-1].get("date") == entry.get("date")
+                and history[-1].get("status") == entry.get("status")
+            ):
+                history[-1] = {**history[-1], **entry}
+            else:
+                history.append(entry)
 
         deduplicated = []
         seen = set()
-        for entry in history:
+        for entry in reversed(history):
             fingerprint = entry.get("id") or (
                 entry.get("status"),
                 entry.get("date"),
@@ -457,23 +1069,109 @@ class FlagStatusChecker:
                 continue
             seen.add(fingerprint)
             deduplicated.append(entry)
-        history = deduplicated[: self.max_history_entries]
+        return deduplicated
 
-        with open(self.history_file, "w", encoding="utf-8") as handle:
-            json.dump(
-                {
-                    "history": history,
-                    "total": len(history),
-                    "page": 1,
-                    "per_page": len(history),
-                },
-                handle,
-                indent=2,
+    def _compact_history(self) -> None:
+        """Fold the log (or the store) into the published history artifacts."""
+        full = self._history_view()
+        self._write_history_shards(full)
+        history = full[: self.max_history_entries]
+
+        self._write_json(
+            self.history_file,
+            {
+                "history": history,
+                "total": len(history),
+                "page": 1,
+                "per_page": len(history),
+            },
+            precompress=True,
+        )
+        if self.background_compaction:
+            self.artifacts.save()
+
+    @property
+    def history_shard_dir(self) -> str:
+        """Shards live beside history.json, e.g. public/api/history/."""
+        return os.path.splitext(self.history_file)[0]
+
+    def _write_history_shards(self, history: List[Dict]) -> None:
+        """Publish the full history as fixed-size pages, per-year files and an index.
+
+        Pages are numbered from the oldest entry, so a new transition only
+        rewrites the final page and the index; earlier pages stay
+        byte-identical and cacheable. Entries inside every shard are newest
+        first, like history.json.
+        """
+        chronological = list(reversed(history))
+        size = self.history_page_size
+        pages = []
+        for number, start in enumerate(range(0, len(chronological), size), start=1):
+            entries = list(reversed(chronological[start : start + size]))
+            path = f"page-{number}.json"
+            self._write_json(
+                os.path.join(self.history_shard_dir, path),
+                {"history": entries, "page": number, "per_page": size},
             )
-            handle.write("\n")
+            pages.append(self._shard_summary(path, entries, page=number))
 
-    def _write_status(self, status: Dict) -> None:
-        existing = self._read_existing_status() or {}
+        years: Dict[str, List[Dict]] = {}
+        undated = 0
+        for entry in history:
+            year = str(entry.get("date", ""))[:4]
+            if not re.fullmatch(r"\d{4}", year):
+                undated += 1
+                continue
+            years.setdefault(year, []).append(entry)
+        if undated:
+            logger.warning("%d history entries without a valid date left out of the year shards", undated)
+        year_shards = []
+        for year in sorted(years):
+            path = os.path.join("years", f"{year}.json")
+            self._write_json(
+                os.path.join(self.history_shard_dir, path),
+                {"history": years[year], "year": int(year), "total": len(years[year])},
+            )
+            year_shards.append(self._shard_summary(path, years[year], year=int(year)))
+
+        # Drop pages left over from a longer history (e.g. after deduplication)
+        # and years that no longer have any entries.
+        for name in os.listdir(self.history_shard_dir):
+            match = re.fullmatch(r"page-(\d+)\.json", name)
+            if match and int(match.group(1)) > len(pages):
+                self.artifacts.remove(os.path.join(self.history_shard_dir, name))
+        years_dir = os.path.join(self.history_shard_dir, "years")
+        for name in os.listdir(years_dir) if os.path.isdir(years_dir) else ():
+            match = re.fullmatch(r"(.*)\.json", name)
+            if match and match.group(1) not in years:
+                self.artifacts.remove(os.path.join(years_dir, name))
+
+        dates = [entry["date"] for entries in years.values() for entry in entries]
+        self._write_json(
+            os.path.join(self.history_shard_dir, "index.json"),
+            {
+                "total": len(history),
+                "per_page": size,
+                "newest": max(dates, default=None),
+                "oldest": min(dates, default=None),
+                "pages": pages,
+                "years": year_shards,
+            },
+        )
+
+    @staticmethod
+    def _shard_summary(path: str, entries: List[Dict], **key) -> Dict:
+        dates = [entry["date"] for entry in entries if entry.get("date")]
+        return {
+            **key,
+            "path": f"history/{path.replace(os.sep, '/')}",
+            "count": len(entries),
+            "from": min(dates, default=None),
+            "to": max(dates, default=None),
+        }
+
+    def _stamp(self, status: Dict, existing: Dict) -> None:
+        """Set `last_updated` and `last_checked` relative to the published status."""
         semantic_fields = ("status", "reason", "source", "source_url", "expires", "verification")
         changed = any(existing.get(field) != status.get(field) for field in semantic_fields)
         status_changed = existing.get("status") != status.get("status")
@@ -487,11 +1185,21 @@ class FlagStatusChecker:
         if not changed:
             status["last_checked"] = self.now.replace(minute=0, second=0, microsecond=0).isoformat()
 
-        os.makedirs(os.path.dirname(self.api_status_file), exist_ok=True)
-        with open(self.api_status_file, "w", encoding="utf-8") as handle:
-            json.dump(status, handle, indent=2)
-            handle.write("\n")
+    def _write_status(self, status: Dict) -> None:
+        existing = self._read_existing_status() or {}
+        self._stamp(status, existing)
+        # Source metrics differ on every run. When nothing else in the status
+        # changed, republish the previous figures so status.json still only
+        # changes with the hourly heartbeat; the metrics export has them all.
+        published = status
+        if existing.get("last_checked") == status.get("last_checked") and _without_metrics(
+            existing.get("checked_sources")
+        ) == _without_metrics(status.get("checked_sources")):
+            published = {**status, "checked_sources": existing["checked_sources"]}
+        self._write_json(self.api_status_file, published, precompress=True)
         self._append_history(status)
+        if self.store:
+            self.store.record_run(status, self.now, self.source_signals, published)
 
         half_staff = status["status"] == "half-staff"
         badge = {
@@ -500,13 +1208,240 @@ class FlagStatusChecker:
             "message": "half-staff" if half_staff else "full-staff",
             "color": "orange" if half_staff else "brightgreen",
         }
-        with open(self.badge_file, "w", encoding="utf-8") as handle:
-            json.dump(badge, handle, indent=2)
-            handle.write("\n")
+        self._write_json(self.badge_file, badge, precompress=True)
+
+    @property
+    def states_dir(self) -> str:
+        return os.path.join(os.path.dirname(self.api_status_file), "states")
+
+    def check_state_news(self) -> Dict[str, Dict]:
+        """Find fresh state-only orders in shared news feeds, by jurisdiction.
+
+        Each feed is fetched once and each item scanned once; a qualifying
+        item is attributed to every jurisdiction its headline names. Nationwide
+        orders are left to the federal checks.
+        """
+        seen = set()
+        found: Dict[str, Dict] = {}
+        with ThreadPoolExecutor(max_workers=len(self.state_news_queries)) as pool:
+            futures = {
+                pool.submit(self._news_feed, query, "state-news"): query
+                for query in self.state_news_queries
+            }
+            for future in as_completed(futures):
+                content = future.result()
+                if content is None:
+                    continue
+                try:
+                    items = list(self._fresh_feed_items(content))
+                except ET.ParseError as error:
+                    logger.error("State news feed unreadable (%s): %s", futures[future], error)
+                    continue
+                for item in items:
+                    link = direct_news_url(item["link"])
+                    if self._seen_before(seen, item["guid"], link):
+                        continue
+                    headline = item["title"].rsplit(" - ", 1)[0]
+                    text = f"{headline} {item['description']}"
+                    scan = scan_text(text)
+                    if scan["national"] or not (scan["half_staff"] and scan["order"]):
+                        continue
+                    # Only the headline attributes an order to a state: descriptions
+                    # name outlets, people and places unrelated to the order.
+                    codes = mentioned_jurisdictions(headline)
+                    if not codes:
+                        continue
+                    published = item["published"]
+                    expires = self._resolve_expiration(scan["expiration"], published)
+                    if not expires:
+                        expires = (published + timedelta(hours=24)).isoformat()
+                    if parse_datetime(expires) <= self.now:
+                        continue
+                    signal = self._signal(
+                        "half-staff",
+                        self._reason_from_text(headline),
+                        f"State order report: {item['title'].rsplit(' - ', 1)[-1]}",
+                        link,
+                        expires,
+                        priority=80,
+                        verification="state-order-headline",
+                    )
+                    for code in codes:
+                        if code not in found or found[code]["expires"] < expires:
+                            found[code] = signal
+        return found
+
+    def _read_state_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.states_dir, "index.json"), encoding="utf-8") as handle:
+                return json.load(handle).get("states", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _federal_signal(self, federal: Dict) -> Dict:
+        """The federal status as one signal for every jurisdiction."""
+        if self._is_active(federal):
+            return self._signal(
+                "half-staff",
+                federal["reason"],
+                federal["source"],
+                federal["source_url"],
+                federal.get("expires"),
+                priority=90,
+                verification="federal-order",
+            )
+        return self._signal(
+            "full-staff",
+            "No active federal or state order",
+            federal["source"],
+            federal["source_url"],
+            priority=5,
+            verification="federal-status",
+        )
+
+    def update_states(self, federal: Dict) -> Dict[str, Dict]:
+        """Resolve and publish the flag status for all 50 states plus D.C.
+
+        Every state's HalfStaff.org widget and the shared state news feeds
+        are fetched concurrently under `state_deadline_seconds`. The federal
+        status, state-only known orders and news verdicts are fetched or
+        loaded once and combined per jurisdiction.
+        """
+        started = time.monotonic()
+        self.deadline = started + self.state_deadline_seconds
+        federal_signal = self._federal_signal(federal)
+        try:
+            orders: Optional[KnownOrderIndex] = KnownOrderIndex.load(self.known_orders_file)
+        except (OSError, json.JSONDecodeError) as error:
+            logger.warning("Known-order registry unavailable for states: %s", error)
+            orders = None
+
+        pool = ThreadPoolExecutor(max_workers=self.max_state_workers)
+        try:
+            news = pool.submit(self.check_state_news)
+            widgets = {code: pool.submit(self.check_halfstaff_api, code) for code in JURISDICTIONS}
+            done, _ = wait([news, *widgets.values()], timeout=self.state_deadline_seconds)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        headlines = news.result() if news in done else {}
+        if news not in done:
+            logger.error("State news missed the %.0fs deadline", self.state_deadline_seconds)
+
+        published = self._read_state_index()
+        states: Dict[str, Dict] = {}
+        for code, name in JURISDICTIONS.items():
+            order = orders.for_jurisdiction(code).active_at(self.now) if orders is not None else None
+            widget = widgets[code].result() if widgets[code] in done else None
+            signals = [dict(federal_signal)]
+            if order:
+                signals.append(
+                    self._signal(
+                        "half-staff",
+                        order["reason"],
+                        order["source"],
+                        order["source_url"],
+                        order["expires"],
+                        priority=100,
+                        verification="verified-order",
+                        order_id=order.get("id"),
+                    )
+                )
+            for signal in (widget, headlines.get(code)):
+                if signal:
+                    signals.append(dict(signal))
+
+            existing = published.get(code) or {}
+            chosen = self._choose_signal(signals, lambda: existing)
+            chosen["last_checked"] = self.now.isoformat()
+            self._stamp(chosen, existing)
+            halfstaff = {"name": "halfstaff-org", "available": widget is not None}
+            if widgets[code] not in done:
+                halfstaff["late"] = True
+            states[code] = {"jurisdiction": code, "name": name, **chosen}
+            self._write_json(
+                os.path.join(self.states_dir, f"{code}.json"),
+                {
+                    **states[code],
+                    "checked_sources": [
+                        {"name": "federal", "available": True},
+                        {"name": "known-orders", "available": order is not None},
+                        halfstaff,
+                        {"name": "state-news", "available": code in headlines},
+                    ],
+                },
+            )
+
+        half_staff = [code for code, state in states.items() if state["status"] == "half-staff"]
+        self._write_json(
+            os.path.join(self.states_dir, "index.json"),
+            {
+                "last_checked": max(state["last_checked"] for state in states.values()),
+                "federal": federal["status"],
+                "half_staff": half_staff,
+                "states": states,
+            },
+            precompress=True,
+        )
+        logger.info(
+            "Resolved %d jurisdictions in %.1fs; half-staff: %s",
+            len(states),
+            time.monotonic() - started,
+            ", ".join(half_staff) or "none",
+        )
+        return states
+
+    def publish_states(self) -> Dict[str, Dict]:
+        """Resolve and publish the states against the already published federal status."""
+        federal = self._read_existing_status()
+        if not federal:
+            raise RuntimeError("No published federal status to resolve the states against")
+        self.artifacts.written = []
+        states = self.update_states(federal)
+        self.artifacts.save()
+        self.http.flush()
+        logger.info("Updated artifacts: %s", ", ".join(self.artifacts.written) or "none")
+        return states
 
     def update_status(self) -> Dict:
+        self.artifacts.written = []
         status = self.get_current_status()
         self._write_status(status)
+        export_metrics(self.metrics_dir, status, self.run_seconds, self.now)
+        if self.include_states:
+            try:
+                self.update_states(status)
+            except Exception:  # the federal status is written; still publish it
+                logger.exception("State resolution failed; publishing the federal status only")
+        self.artifacts.save()
+        self.http.flush()
+        self._save_article_memo()
+        if self.artifacts.written:
+            logger.info("Updated artifacts: %s", ", ".join(self.artifacts.written))
+        else:
+            logger.info("All artifacts unchanged")
+        for path, sizes in sorted(self.artifacts.sizes.items()):
+            logger.info(
+                "Artifact %s: %s",
+                path,
+                ", ".join(f"{encoding} {size} B" for encoding, size in sizes.items()),
+            )
+        for source in status["checked_sources"]:
+            if "seconds" in source:
+                logger.info(
+                    "Source %s: %.2fs, %d requests, %d bytes, items %s",
+                    source["name"],
+                    source["seconds"],
+                    source["requests"],
+                    source["bytes"],
+                    source["items"] or "-",
+                )
+        for host, counts in sorted(self.http.stats().items()):
+            logger.info(
+                "HTTP %s: %d requests, %d on reused connections",
+                host,
+                counts["requests"],
+                counts["reused"],
+            )
         logger.info(
             "Flag status resolved: %s (source=%s, verification=%s)",
             status["status"],
@@ -516,8 +1451,130 @@ class FlagStatusChecker:
         return status
 
 
+# Where runs against --sources-base publish unless --output-root says otherwise.
+SIMULATED_OUTPUT_ROOT = os.path.join(".cache", "simulated")
+
+
+def _configure(
+    checker: FlagStatusChecker,
+    sources_base: Optional[str],
+    metrics_dir: Optional[str],
+    output_root: Optional[str],
+) -> None:
+    if sources_base and not output_root:
+        output_root = SIMULATED_OUTPUT_ROOT
+    if output_root:
+        checker.use_output_root(output_root)
+        logger.info("Publishing under %s instead of the repository", output_root)
+    if metrics_dir:
+        checker.metrics_dir = metrics_dir
+    if sources_base:
+        checker.use_source_base(sources_base)
+
+
+def run_daemon(
+    interval: float,
+    stop: Optional[threading.Event] = None,
+    store: Optional[StatusStore] = None,
+    states: bool = False,
+    sources_base: Optional[str] = None,
+    metrics_dir: Optional[str] = None,
+    output_root: Optional[str] = None,
+) -> None:
+    """Re-resolve every `interval` seconds in one warm process until stopped.
+
+    The checker, its pooled HTTP session, the conditional-GET cache, the
+    article memo and the known-order index all stay in memory between
+    cycles; only the clock is advanced.
+    """
+    stop = stop or threading.Event()
+    checker = FlagStatusChecker()
+    checker.store = store
+    checker.include_states = states
+    _configure(checker, sources_base, metrics_dir, output_root)
+    checker.background_compaction = True
+    try:
+        while not stop.is_set():
+            started = time.monotonic()
+            checker.now = datetime.now(UTC)
+            try:
+                checker.update_status()
+            except Exception:  # keep the daemon alive across a failed cycle
+                logger.exception("Scheduled status check failed")
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+    finally:
+        checker._compactor.shutdown(wait=True)
+        checker.http.close()
+
+
 def main():
-    FlagStatusChecker().update_status()
+    parser = argparse.ArgumentParser(description="Resolve and publish the federal flag status.")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="keep running and re-resolve on an interval instead of exiting",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=300,
+        help="seconds between checks in --daemon mode (default: 300)",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="PATH",
+        help="keep history, known orders and observations in this SQLite database",
+    )
+    parser.add_argument(
+        "--states",
+        action="store_true",
+        help="also resolve and publish all 50 states plus D.C. under public/api/states",
+    )
+    parser.add_argument(
+        "--states-only",
+        action="store_true",
+        help="only resolve and publish the states, against the federal status already published",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        metavar="DIR",
+        help="write flag_status.prom and the rolling metrics.jsonl here "
+        "(default: .cache/flag-status/metrics)",
+    )
+    parser.add_argument(
+        "--sources-base",
+        metavar="URL",
+        help="fetch every source from this origin instead (e.g. the server.py source simulator); "
+        f"output then goes under {SIMULATED_OUTPUT_ROOT} unless --output-root is given",
+    )
+    parser.add_argument(
+        "--output-root",
+        metavar="DIR",
+        help="publish artifacts, the history log and caches under DIR instead of the repository",
+    )
+    args = parser.parse_args()
+    if args.states_only and args.daemon:
+        parser.error("--states-only cannot be combined with --daemon")
+    store = StatusStore(args.store) if args.store else None
+
+    if not args.daemon:
+        checker = FlagStatusChecker()
+        checker.store = store
+        checker.include_states = args.states
+        _configure(checker, args.sources_base, args.metrics_dir, args.output_root)
+        if args.states_only:
+            checker.publish_states()
+        else:
+            checker.update_status()
+        return
+
+    stop = threading.Event()
+    for name in ("SIGINT", "SIGTERM"):
+        signal.signal(getattr(signal, name), lambda *_: stop.set())
+    logger.info("Daemon mode: checking every %.0f seconds", args.interval)
+    run_daemon(
+        args.interval, stop, store, args.states, args.sources_base, args.metrics_dir, args.output_root
+    )
 
 
 if __name__ == "__main__":
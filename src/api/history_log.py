@@ -0,0 +1,106 @@
+"""Append-only, segmented log of flag-status history records.
+
+Each line of a segment is one JSON record `{"seq", "recorded", "entry"}`
+holding the full state of a history entry at the time it was written. A
+status transition appends a new entry; enriching the current transition
+appends the merged entry again under its original `date`. Segments are
+named by the year they were written (`2026.jsonl`), so listing them in
+name order replays the log in order.
+"""
+
+import glob
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _last_line(path: str, block_size: int = 4096) -> Optional[bytes]:
+    """Read the final non-empty line of a file without reading the rest."""
+    with open(path, "rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell()
+        tail = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            handle.seek(position)
+            tail = handle.read(step) + tail
+            stripped = tail.rstrip(b"\n")
+            if b"\n" in stripped:
+                return stripped.rsplit(b"\n", 1)[1]
+        return tail.rstrip(b"\n") or None
+
+
+class HistoryLog:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._tail: Optional[Dict] = None
+        self._tail_loaded = False
+
+    def segments(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "*.jsonl")))
+
+    def tail(self) -> Optional[Dict]:
+        """Return the newest record, reading only the end of the last segment."""
+        with self._lock:
+            if not self._tail_loaded:
+                self._tail = None
+                for path in reversed(self.segments()):
+                    line = _last_line(path)
+                    if not line:
+                        continue
+                    try:
+                        self._tail = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final write: fall back to the last whole record.
+                        self._tail = None
+                        for record in self._segment_records(path):
+                            self._tail = record
+                    if self._tail:
+                        break
+                self._tail_loaded = True
+            return self._tail
+
+    def append(self, entry: Dict, recorded: datetime) -> Dict:
+        """Append one entry state and return its record."""
+        tail = self.tail()
+        with self._lock:
+            record = {
+                "seq": (tail["seq"] if tail else 0) + 1,
+                "recorded": recorded.isoformat(),
+                "entry": entry,
+            }
+            os.makedirs(self.directory, exist_ok=True)
+            segment = os.path.join(self.directory, f"{recorded.year:04d}.jsonl")
+            line = json.dumps(record, separators=(",", ":")) + "\n"
+            if os.path.exists(segment) and os.path.getsize(segment):
+                with open(segment, "rb") as handle:
+                    handle.seek(-1, os.SEEK_END)
+                    if handle.read(1) != b"\n":
+                        line = "\n" + line
+            with open(segment, "a", encoding="utf-8") as handle:
+                handle.write(line)
+            self._tail = record
+            return record
+
+    @staticmethod
+    def _segment_records(path: str) -> Iterator[Dict]:
+        with open(path, encoding="utf-8") as handle:
+            for number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping unreadable record %s:%d", path, number)
+
+    def records(self) -> Iterator[Dict]:
+        """Replay every record, oldest first."""
+        for path in self.segments():
+            yield from self._segment_records(path)
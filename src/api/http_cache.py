@@ -0,0 +1,131 @@
+"""On-disk conditional-GET cache for source fetches.
+
+Responses carrying an `ETag` or `Last-Modified` validator are stored on disk.
+The next fetch of the same URL revalidates with `If-None-Match` /
+`If-Modified-Since`, and a `304 Not Modified` is answered from the stored
+body. The cache is bounded by total body size and evicts least recently used
+entries first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    def __init__(self, directory: str, max_bytes: int = 20 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        self._dirty = False
+        try:
+            with open(self.index_file, encoding="utf-8") as handle:
+                self._index = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            self._index = {}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.body")
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the stored entry for `url` (with its body), if any."""
+        key = self._key(url)
+        with self._lock:
+            entry = self._index.get(key)
+        if not entry:
+            return None
+        try:
+            with open(self._body_path(key), "rb") as handle:
+                body = handle.read()
+        except OSError:
+            with self._lock:
+                self._index.pop(key, None)
+            return None
+        return {**entry, "body": body}
+
+    @staticmethod
+    def validators(entry: Dict) -> Dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revive(self, url: str, response: requests.Response, entry: Dict) -> requests.Response:
+        """Turn a 304 into the stored 200 response and mark it recently used."""
+        response.status_code = 200
+        response.reason = "OK"
+        response._content = entry["body"]
+        if entry.get("content_type"):
+            response.headers["Content-Type"] = entry["content_type"]
+        with self._lock:
+            if self._key(url) in self._index:
+                self._index[self._key(url)]["used"] = time.time()
+                self._dirty = True
+        return response
+
+    def store(self, url: str, response: requests.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        key = self._key(url)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._body_path(key), "wb") as handle:
+            handle.write(body)
+        with self._lock:
+            self._index[key] = {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_type": response.headers.get("Content-Type"),
+                "size": len(body),
+                "used": time.time(),
+            }
+            self._dirty = True
+            self._evict()
+
+    def _evict(self) -> None:
+        total = sum(entry["size"] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda item: self._index[item]["used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+
+    def save(self) -> None:
+        """Persist the index; bodies are written as soon as they are stored."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self._index)
+            self._dirty = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f"{self.index_file}.tmp"
+            with open(temporary, "w", encoding="utf-8") as handle:
+                json.dump(snapshot, handle)
+            os.replace(temporary, self.index_file)
+        except OSError as error:
+            logger.warning("HTTP cache index not saved: %s", error)
@@ -0,0 +1,172 @@
+"""Shared keep-alive HTTP layer for the status checker.
+
+Every source fetch goes through one `HttpSession`, so repeated requests to
+whitehouse.gov, bing.com and halfstaff.org reuse pooled TCP/TLS connections
+instead of paying a fresh handshake each time.
+"""
+
+import math
+import threading
+import time
+import urllib.parse
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpSession:
+    """A pooled `requests.Session` with per-host limits and reuse stats.
+
+    `connect_timeout` and `read_timeout` are applied separately. Callers may
+    pass a smaller `budget` (seconds) that caps both, which is how the
+    checker's run-wide deadline reaches individual requests. An optional
+    `cache` (see `http_cache.HttpCache`) turns repeat fetches into
+    conditional GETs.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 15.0,
+        max_per_host: int = 6,
+        cache=None,
+    ):
+        self.cache = cache
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_per_host = max_per_host
+        self._session = requests.Session()
+        self._session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max_per_host)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self.requests: List[Dict] = []
+
+    def _host_limit(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def get(
+        self,
+        url: str,
+        budget: Optional[float] = None,
+        source: Optional[str] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """GET `url`, recording connection reuse and cache use under `source`."""
+        host = urllib.parse.urlsplit(url).netloc
+        full_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        cache_key = entry = None
+        if self.cache is not None:
+            cache_key = full_url
+            entry = self.cache.lookup(cache_key)
+            if entry:
+                kwargs["headers"] = {**kwargs.get("headers", {}), **self.cache.validators(entry)}
+        # No deadline arrives as an infinite budget, which acquire() rejects.
+        if budget is not None and math.isinf(budget):
+            budget = None
+        cap = float("inf") if budget is None else budget
+        timeout = (min(self.connect_timeout, cap), min(self.read_timeout, cap))
+
+        limit = self._host_limit(host)
+        if not limit.acquire(timeout=None if budget is None else max(budget, 0)):
+            raise requests.Timeout(f"No free connection slot for {host} within budget")
+        started = time.monotonic()
+        try:
+            # Stream the headers first so the pooled connection can be
+            # inspected before `.content` reads the body and releases it.
+            response = self._session.get(url, timeout=timeout, stream=True, **kwargs)
+            connection = getattr(response.raw, "connection", None)
+            uses = getattr(connection, "_flag_status_uses", 0)
+            if connection is not None:
+                connection._flag_status_uses = uses + 1
+            transferred = len(response.content)
+        finally:
+            limit.release()
+
+        status = response.status_code
+        cache_state = None
+        if entry and status == 304:
+            response = self.cache.revive(cache_key, response, entry)
+            cache_state = "hit"
+        elif cache_key is not None and status == 200:
+            self.cache.store(cache_key, response)
+            cache_state = "miss"
+
+        with self._lock:
+            self.requests.append(
+                {
+                    "source": source,
+                    "host": host,
+                    "url": full_url,
+                    "status": status,
+                    "reused": uses > 0,
+                    "cache": cache_state,
+                    "bytes": transferred,
+                    "seconds": round(time.monotonic() - started, 3),
+                }
+            )
+        return response
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = []
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Summarize requests and connection reuse per host."""
+        summary: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for record in self.requests:
+                host = summary.setdefault(record["host"], {"requests": 0, "reused": 0})
+                host["requests"] += 1
+                host["reused"] += int(record["reused"])
+        return summary
+
+    def source_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Count cache hits and misses for each named source."""
+        summary: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for record in self.requests:
+                if record["source"] is None or record["cache"] is None:
+                    continue
+                counts = summary.setdefault(record["source"], {"hits": 0, "misses": 0})
+                counts["hits" if record["cache"] == "hit" else "misses"] += 1
+        return summary
+
+    def source_stats(self) -> Dict[str, Dict]:
+        """Requests, body bytes, HTTP statuses and repeat fetches per source.
+
+        A URL fetched again by the same source within a run counts as a
+        repeat fetch. The session itself never retries a request.
+        """
+        summary: Dict[str, Dict] = {}
+        seen = set()
+        with self._lock:
+            for record in self.requests:
+                if record["source"] is None:
+                    continue
+                source = summary.setdefault(
+                    record["source"], {"requests": 0, "bytes": 0, "statuses": {}, "repeat_fetches": 0}
+                )
+                source["requests"] += 1
+                source["bytes"] += record.get("bytes", 0)
+                status = str(record["status"])
+                source["statuses"][status] = source["statuses"].get(status, 0) + 1
+                key = (record["source"], record["url"])
+                source["repeat_fetches"] += int(key in seen)
+                seen.add(key)
+        return summary
+
+    def flush(self) -> None:
+        if self.cache is not None:
+            self.cache.save()
+
+    def close(self) -> None:
+        self.flush()
+        self._session.close()
@@ -0,0 +1,91 @@
+"""The 50 states plus D.C., and detection of which ones a text refers to.
+
+One scanner over lowercased text finds every jurisdiction named in it, so a
+shared document is read once and its verdict fanned out to each state it
+mentions rather than re-scanned per state.
+"""
+
+import re
+from typing import Dict, Set
+
+JURISDICTIONS: Dict[str, str] = {
+    "AL": "Alabama",
+    "AK": "Alaska",
+    "AZ": "Arizona",
+    "AR": "Arkansas",
+    "CA": "California",
+    "CO": "Colorado",
+    "CT": "Connecticut",
+    "DE": "Delaware",
+    "FL": "Florida",
+    "GA": "Georgia",
+    "HI": "Hawaii",
+    "ID": "Idaho",
+    "IL": "Illinois",
+    "IN": "Indiana",
+    "IA": "Iowa",
+    "KS": "Kansas",
+    "KY": "Kentucky",
+    "LA": "Louisiana",
+    "ME": "Maine",
+    "MD": "Maryland",
+    "MA": "Massachusetts",
+    "MI": "Michigan",
+    "MN": "Minnesota",
+    "MS": "Mississippi",
+    "MO": "Missouri",
+    "MT": "Montana",
+    "NE": "Nebraska",
+    "NV": "Nevada",
+    "NH": "New Hampshire",
+    "NJ": "New Jersey",
+    "NM": "New Mexico",
+    "NY": "New York",
+    "NC": "North Carolina",
+    "ND": "North Dakota",
+    "OH": "Ohio",
+    "OK": "Oklahoma",
+    "OR": "Oregon",
+    "PA": "Pennsylvania",
+    "RI": "Rhode Island",
+    "SC": "South Carolina",
+    "SD": "South Dakota",
+    "TN": "Tennessee",
+    "TX": "Texas",
+    "UT": "Utah",
+    "VT": "Vermont",
+    "VA": "Virginia",
+    "WA": "Washington",
+    "WV": "West Virginia",
+    "WI": "Wisconsin",
+    "WY": "Wyoming",
+    "DC": "District of Columbia",
+}
+
+# D.C. is tried first so "Washington, D.C." is not read as the state.
+MENTION_SCANNER = re.compile(
+    r"\b(?:(?P<DC>district\s+of\s+columbia|washington,?\s+d\.?\s?c\b\.?|d\.c\.)"
+    + "".join(
+        "|(?P<{}>{})".format(code, r"\s+".join(name.lower().split()) + r"\b")
+        for code, name in JURISDICTIONS.items()
+        if code != "DC"
+    )
+    + ")"
+)
+
+
+# Names that contain a jurisdiction's name without referring to it. They are
+# blanked out before scanning, so "New York Times" does not count as New York.
+NOT_JURISDICTIONS = re.compile(
+    r"\b(?:george\s+washington|booker\s+t\.?\s+washington|denzel\s+washington"
+    r"|washington\s+(?:post|times|examiner|commanders|nationals|wizards|capitals|monthly)"
+    r"|new\s+york\s+(?:times|post|daily\s+news|magazine|stock\s+exchange|yankees|mets|knicks|giants|jets)"
+    r"|(?:kansas|oklahoma|carson|iowa|jersey|virginia)\s+city"
+    r"|indiana\s+jones|virginia\s+tech|texas\s+instruments|washington\s+university)\b"
+)
+
+
+def mentioned_jurisdictions(text: str) -> Set[str]:
+    """Return the codes of every jurisdiction named in `text`."""
+    text = NOT_JURISDICTIONS.sub(" ", text.lower())
+    return {match.lastgroup for match in MENTION_SCANNER.finditer(text)}
@@ -0,0 +1,122 @@
+"""Per-run source metrics as a Prometheus text file and a rolling JSONL log.
+
+The text file follows the node_exporter textfile-collector format and is
+replaced atomically each run. The JSONL log gains one line per run and is
+rotated to a single `.1` backup once it passes `max_bytes`.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List
+
+try:  # imported as src.api.metrics (tests and tooling)
+    from .artifacts import atomic_write
+except ImportError:  # executed directly as src/api/check_status.py
+    from artifacts import atomic_write
+
+logger = logging.getLogger(__name__)
+
+SOURCE_GAUGES = (
+    ("available", "Whether the source returned a signal (1) or not (0)."),
+    ("late", "Whether the source missed the run deadline."),
+    ("seconds", "Wall time of the source's check in seconds."),
+    ("requests", "HTTP requests made by the source."),
+    ("bytes", "Response body bytes transferred for the source."),
+    ("repeat_fetches", "Repeat GETs of a URL the source had already fetched this run (not retries)."),
+)
+
+
+def _labels(**labels) -> str:
+    escaped = {
+        key: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for key, value in labels.items()
+    }
+    return ",".join(f'{key}="{value}"' for key, value in escaped.items())
+
+
+def render_prometheus(status: Dict, run_seconds: float, checked: datetime) -> str:
+    """Render one run's status and per-source metrics as Prometheus text."""
+    sources: List[Dict] = status.get("checked_sources", [])
+    lines = [
+        "# HELP flag_status_half_staff Whether the published status is half-staff.",
+        "# TYPE flag_status_half_staff gauge",
+        f"flag_status_half_staff {int(status.get('status') == 'half-staff')}",
+        "# HELP flag_status_run_seconds Wall time spent resolving the status.",
+        "# TYPE flag_status_run_seconds gauge",
+        f"flag_status_run_seconds {run_seconds:.3f}",
+        "# HELP flag_status_last_run_timestamp_seconds When the last run resolved.",
+        "# TYPE flag_status_last_run_timestamp_seconds gauge",
+        f"flag_status_last_run_timestamp_seconds {checked.timestamp():.0f}",
+    ]
+    for field, help_text in SOURCE_GAUGES:
+        lines += [
+            f"# HELP flag_status_source_{field} {help_text}",
+            f"# TYPE flag_status_source_{field} gauge",
+        ]
+        for source in sources:
+            value = source.get(field, 0)
+            lines.append(f"flag_status_source_{field}{{{_labels(source=source['name'])}}} {float(value):g}")
+
+    lines += [
+        "# HELP flag_status_source_responses HTTP responses per source and status code.",
+        "# TYPE flag_status_source_responses gauge",
+    ]
+    for source in sources:
+        for code, count in sorted(source.get("statuses", {}).items()):
+            lines.append(f"flag_status_source_responses{{{_labels(source=source['name'], code=code)}}} {count}")
+
+    lines += [
+        "# HELP flag_status_source_cache Conditional-GET cache results per source.",
+        "# TYPE flag_status_source_cache gauge",
+    ]
+    for source in sources:
+        for result, count in sorted(source.get("cache", {}).items()):
+            lines.append(f"flag_status_source_cache{{{_labels(source=source['name'], result=result)}}} {count}")
+
+    lines += [
+        "# HELP flag_status_source_items Items (feed entries, links, articles, orders) processed.",
+        "# TYPE flag_status_source_items gauge",
+    ]
+    for source in sources:
+        for kind, count in sorted(source.get("items", {}).items()):
+            lines.append(f"flag_status_source_items{{{_labels(source=source['name'], kind=kind)}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsLog:
+    def __init__(self, path: str, max_bytes: int = 5 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def append(self, record: Dict) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        try:
+            if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                os.replace(self.path, f"{self.path}.1")
+        except OSError:
+            pass
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line)
+
+
+def export(directory: str, status: Dict, run_seconds: float, checked: datetime) -> None:
+    """Write the Prometheus text file and append the run to the JSONL log."""
+    try:
+        atomic_write(
+            os.path.join(directory, "flag_status.prom"),
+            render_prometheus(status, run_seconds, checked).encode("utf-8"),
+        )
+        MetricsLog(os.path.join(directory, "metrics.jsonl")).append(
+            {
+                "checked": checked.isoformat(),
+                "status": status.get("status"),
+                "source": status.get("source"),
+                "run_seconds": round(run_seconds, 3),
+                "sources": status.get("checked_sources", []),
+            }
+        )
+    except OSError as error:
+        logger.warning("Metrics not exported: %s", error)
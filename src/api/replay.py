@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Replay the resolver over archived source snapshots.
+
+A snapshot directory holds one sub-directory per capture, named by its UTC
+capture time (`2026-07-12T17-00-00Z`). Each capture has an `index.json`
+mapping the exact URLs the checker requests (query string included) to the
+archived HalfStaff JSON, Bing RSS and White House HTML files next to it:
+
+    snapshots/2026-07-12T17-00-00Z/index.json
+    {
+      "https://halfstaff.org/wp-json/halfstaff/v1/widget": "halfstaff.json",
+      "https://www.whitehouse.gov/presidential-actions/proclamations/": "listing.html",
+      "https://www.bing.com/news/search?q=...&format=rss": "news-1.xml"
+    }
+
+Each replayed `now` is answered from the newest capture at or before it; a
+URL missing from that capture behaves like a failed fetch. The timestamps
+are split into contiguous chunks that run in worker processes. Each chunk
+works like the daemon: one checker whose clock is advanced, with the
+previous resolved status standing in for the published one. A few steps
+before each chunk are replayed and discarded, so retained orders carry
+across chunk boundaries.
+
+Run from the repository root:
+
+    python -m src.api.replay snapshots/ --step 60 --output timeline.json
+"""
+
+import argparse
+import bisect
+import functools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+try:  # imported as src.api.replay (tests and `python -m`)
+    from .check_status import UTC, FlagStatusChecker, parse_datetime
+    from .check_status import logger as checker_logger
+except ImportError:  # executed directly as src/api/replay.py
+    from check_status import UTC, FlagStatusChecker, parse_datetime
+    from check_status import logger as checker_logger
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_FORMAT = "%Y-%m-%dT%H-%M-%SZ"
+
+
+def capture_time(name: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(name, CAPTURE_FORMAT).replace(tzinfo=UTC)
+    except ValueError:
+        return parse_datetime(name)
+
+
+@functools.lru_cache(maxsize=256)
+def _read(path: str) -> bytes:
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+class SnapshotCatalog:
+    """Captures in a snapshot directory, ordered by capture time."""
+
+    def __init__(self, directory: str):
+        captures = []
+        for name in os.listdir(directory):
+            captured = capture_time(name)
+            path = os.path.join(directory, name)
+            if captured and os.path.exists(os.path.join(path, "index.json")):
+                captures.append((captured, path))
+        captures.sort()
+        self.directory = directory
+        self.times = [captured for captured, _ in captures]
+        self.paths = [path for _, path in captures]
+        self._indexes: Dict[str, Dict[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def capture_at(self, moment: datetime) -> Optional[str]:
+        position = bisect.bisect_right(self.times, moment) - 1
+        return self.paths[position] if position >= 0 else None
+
+    def content(self, moment: datetime, url: str) -> Optional[bytes]:
+        capture = self.capture_at(moment)
+        if capture is None:
+            return None
+        if capture not in self._indexes:
+            with open(os.path.join(capture, "index.json"), encoding="utf-8") as handle:
+                self._indexes[capture] = json.load(handle)
+        name = self._indexes[capture].get(url)
+        return _read(os.path.join(capture, name)) if name else None
+
+
+class SnapshotSession:
+    """Stands in for `HttpSession`, answering GETs from archived captures."""
+
+    def __init__(self, catalog: SnapshotCatalog):
+        self.catalog = catalog
+        self.now: Optional[datetime] = None
+
+    def get(self, url: str, budget=None, source=None, **kwargs) -> requests.Response:
+        url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        content = self.catalog.content(self.now, url)
+        if content is None:
+            raise requests.ConnectionError(f"{url} was not captured by {self.now.isoformat()}")
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = content
+        return response
+
+    def reset_stats(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {}
+
+    def source_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        return {}
+
+    def source_stats(self) -> Dict[str, Dict]:
+        return {}
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayChecker(FlagStatusChecker):
+    """A checker whose "published" status is the previous replayed result."""
+
+    def __init__(self, now: datetime, http: SnapshotSession, known_orders_file: Optional[str] = None):
+        super().__init__(now=now, http=http)
+        if known_orders_file:
+            self.known_orders_file = known_orders_file
+        # Start with an empty article memo instead of the live run's cache.
+        self._articles = {}
+        self.previous: Optional[Dict] = None
+
+    def _read_existing_status(self) -> Optional[Dict]:
+        return self.previous
+
+    def resolve_at(self, moment: datetime) -> Optional[Dict]:
+        self.now = self.http.now = moment
+        try:
+            status = self.get_current_status()
+        except RuntimeError:
+            return None
+        self.previous = status
+        return status
+
+
+@functools.lru_cache(maxsize=4)
+def _catalog(directory: str) -> SnapshotCatalog:
+    return SnapshotCatalog(directory)
+
+
+def _timeline_entry(moment: datetime, status: Optional[Dict], capture: Optional[str]) -> Dict:
+    entry = {
+        "now": moment.isoformat(),
+        "capture": os.path.basename(capture) if capture else None,
+    }
+    if status is None:
+        return {**entry, "status": None}
+    return {
+        **entry,
+        **{
+            field: status.get(field)
+            for field in ("status", "reason", "source", "verification", "expires")
+        },
+        "unavailable": [
+            source["name"] for source in status["checked_sources"] if not source["available"]
+        ],
+    }
+
+
+def _replay_chunk(task: Tuple[str, List[datetime], List[datetime], Optional[str]]) -> List[Dict]:
+    """Worker: replay one contiguous run of timestamps after a short warm-up."""
+    directory, warmup, moments, known_orders_file = task
+    checker_logger.setLevel(logging.CRITICAL)
+    catalog = _catalog(directory)
+    checker = ReplayChecker(moments[0], SnapshotSession(catalog), known_orders_file)
+    for moment in warmup:
+        checker.resolve_at(moment)
+    timeline = []
+    for moment in moments:
+        status = checker.resolve_at(moment)
+        timeline.append(_timeline_entry(moment, status, catalog.capture_at(moment)))
+    checker._compactor.shutdown()
+    return timeline
+
+
+def moments_between(start: datetime, end: datetime, step: timedelta) -> List[datetime]:
+    moments = []
+    moment = start
+    while moment <= end:
+        moments.append(moment)
+        moment += step
+    return moments
+
+
+def replay(
+    directory: str,
+    moments: List[datetime],
+    workers: Optional[int] = None,
+    known_orders_file: Optional[str] = None,
+    warmup_steps: int = 24,
+) -> Dict:
+    """Resolve every moment in worker processes and summarize the timeline."""
+    workers = workers or os.cpu_count() or 1
+    # Several chunks per worker keep the pool busy when chunks take uneven time.
+    size = max(1, -(-len(moments) // (workers * 4)))
+    tasks = [
+        (
+            directory,
+            moments[max(0, offset - warmup_steps) : offset],
+            moments[offset : offset + size],
+            known_orders_file,
+        )
+        for offset in range(0, len(moments), size)
+    ]
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        timeline = [entry for chunk in pool.map(_replay_chunk, tasks) for entry in chunk]
+    seconds = time.monotonic() - started
+
+    transitions = [
+        entry
+        for position, entry in enumerate(timeline)
+        if position == 0 or entry["status"] != timeline[position - 1]["status"]
+    ]
+    counts: Dict[str, int] = {}
+    for entry in timeline:
+        counts[str(entry["status"])] = counts.get(str(entry["status"]), 0) + 1
+    return {
+        "summary": {
+            "evaluations": len(timeline),
+            "workers": workers,
+            "chunks": len(tasks),
+            "seconds": round(seconds, 3),
+            "per_second": round(len(timeline) / seconds, 1) if seconds else None,
+            "statuses": counts,
+            "transitions": len(transitions),
+        },
+        "transitions": transitions,
+        "timeline": timeline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the resolver over archived source snapshots.")
+    parser.add_argument("snapshots", help="directory of captures named like 2026-07-12T17-00-00Z")
+    parser.add_argument("--start", help="first timestamp (default: first capture)")
+    parser.add_argument("--end", help="last timestamp (default: last capture)")
+    parser.add_argument("--step", type=float, default=60, help="minutes between timestamps (default: 60)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--known-orders", metavar="PATH", help="known-order registry to replay against")
+    parser.add_argument("--output", metavar="PATH", help="write the timeline as JSON here")
+    args = parser.parse_args()
+
+    catalog = SnapshotCatalog(args.snapshots)
+    if not len(catalog):
+        parser.error(f"no captures with an index.json under {args.snapshots}")
+    start = parse_datetime(args.start) if args.start else catalog.times[0]
+    end = parse_datetime(args.end) if args.end else catalog.times[-1]
+    moments = moments_between(start, end, timedelta(minutes=args.step))
+    logger.info("Replaying %d timestamps over %d captures", len(moments), len(catalog))
+
+    result = replay(args.snapshots, moments, args.workers, args.known_orders)
+    summary = result["summary"]
+    logger.info(
+        "Replayed %d timestamps in %.1fs with %d workers (%.1f/s); %d transitions",
+        summary["evaluations"],
+        summary["seconds"],
+        summary["workers"],
+        summary["per_second"] or 0,
+        summary["transitions"],
+    )
+    for entry in result["transitions"]:
+        logger.info("%s  %s  (%s)", entry["now"], entry["status"], entry.get("verification"))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(result, handle, indent=2)
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
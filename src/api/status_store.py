@@ -0,0 +1,214 @@
+"""Optional SQLite store for resolution state.
+
+When enabled (`check_status.py --store PATH`), history, the known-order
+registry, the last published status and every per-source observation are
+kept in one indexed database. The public JSON files become export views of
+it: history is read back with an indexed, de-duplicating query instead of
+replaying and scanning every entry.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    seq INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    order_id TEXT,
+    source TEXT,
+    verification TEXT,
+    entry TEXT NOT NULL,
+    UNIQUE (date, status)
+);
+CREATE INDEX IF NOT EXISTS history_date ON history (date);
+CREATE INDEX IF NOT EXISTS history_status ON history (status, date);
+CREATE INDEX IF NOT EXISTS history_order ON history (order_id, seq);
+CREATE INDEX IF NOT EXISTS history_source ON history (source, date);
+
+CREATE TABLE IF NOT EXISTS known_orders (
+    id TEXT PRIMARY KEY,
+    starts TEXT NOT NULL,
+    expires TEXT NOT NULL,
+    source TEXT,
+    body TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    checked TEXT NOT NULL,
+    source TEXT NOT NULL,
+    available INTEGER NOT NULL,
+    late INTEGER NOT NULL DEFAULT 0,
+    status TEXT,
+    detail TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS observations_source ON observations (source, checked);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def instant(moment: datetime) -> str:
+    """Fixed-width UTC timestamp, so text comparison is chronological."""
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class StatusStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._db.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    # History -----------------------------------------------------------
+
+    def history_seq(self) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT MAX(seq) FROM history").fetchone()
+        return row[0] or 0
+
+    def record_history(self, records: Iterable[Dict]) -> None:
+        """Upsert history-log records; a later record for the same transition wins."""
+        rows = [
+            (
+                record["seq"],
+                record["entry"].get("date", ""),
+                record["entry"].get("status", ""),
+                record["entry"].get("id"),
+                record["entry"].get("source"),
+                record["entry"].get("verification"),
+                json.dumps(record["entry"]),
+            )
+            for record in records
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO history (seq, date, status, order_id, source, verification, entry) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (date, status) DO UPDATE SET seq = excluded.seq, "
+                "order_id = excluded.order_id, source = excluded.source, "
+                "verification = excluded.verification, entry = excluded.entry",
+                rows,
+            )
+
+    def history(
+        self,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+        source: Optional[str] = None,
+        order_id: Optional[str] = None,
+    ) -> List[Dict]:
+        """Newest-first history; an order logged more than once appears once."""
+        clauses = [
+            "(h.order_id IS NULL OR h.seq = "
+            "(SELECT MAX(seq) FROM history WHERE order_id = h.order_id))"
+        ]
+        params: List = []
+        for column, value in (("status", status), ("source", source), ("order_id", order_id)):
+            if value is not None:
+                clauses.append(f"h.{column} = ?")
+                params.append(value)
+        query = f"SELECT entry FROM history h WHERE {' AND '.join(clauses)} ORDER BY h.seq DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [json.loads(row[0]) for row in self._db.execute(query, params)]
+
+    # Known orders ------------------------------------------------------
+
+    def sync_known_orders(self, orders: Iterable[Tuple[Dict, datetime, datetime]], digest: str) -> bool:
+        """Replace the stored registry when the file's content hash changed."""
+        rows = [
+            (
+                order.get("id") or f"order-{position}",
+                instant(starts),
+                instant(expires),
+                order.get("source"),
+                json.dumps(order),
+            )
+            for position, (order, starts, expires) in enumerate(orders)
+        ]
+        with self._lock, self._db:
+            if self._meta("known_orders_digest") == digest:
+                return False
+            self._db.execute("DELETE FROM known_orders")
+            self._db.executemany("INSERT OR REPLACE INTO known_orders VALUES (?, ?, ?, ?, ?)", rows)
+            self._set_meta("known_orders_digest", digest)
+        return True
+
+    # Status and observations -------------------------------------------
+
+    def current_status(self) -> Optional[Dict]:
+        with self._lock:
+            value = self._meta("status")
+        return json.loads(value) if value else None
+
+    def record_run(
+        self,
+        status: Dict,
+        checked: datetime,
+        signals: Dict[str, Optional[Dict]],
+        published: Optional[Dict] = None,
+    ) -> None:
+        """Store the published status and one observation per checked source.
+
+        `published` is the status as written to status.json when it differs
+        from `status` (which keeps this run's own source metrics).
+        """
+        at = instant(checked)
+        rows = []
+        for source in status.get("checked_sources", []):
+            signal = signals.get(source["name"])
+            rows.append(
+                (
+                    at,
+                    source["name"],
+                    int(source.get("available", False)),
+                    int(source.get("late", False)),
+                    signal.get("status") if signal else None,
+                    json.dumps({**source, "signal": signal}),
+                )
+            )
+        with self._lock, self._db:
+            self._set_meta("status", json.dumps(published or status))
+            self._db.executemany(
+                "INSERT INTO observations (checked, source, available, late, status, detail) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def observations(self, source: str, limit: int = 100) -> List[Dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT checked, available, late, detail FROM observations "
+                "WHERE source = ? ORDER BY checked DESC LIMIT ?",
+                (source, limit),
+            ).fetchall()
+        return [
+            {"checked": checked, "available": bool(available), "late": bool(late), **json.loads(detail)}
+            for checked, available, late, detail in rows
+        ]
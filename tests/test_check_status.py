@@ -1,11 +1,32 @@
+import gzip
 import json
+import os
 import tempfile
+import threading
+import time
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import patch
 
-from src.api.check_status import FlagStatusChecker, parse_datetime
+import requests
+from bs4 import BeautifulSoup
+
+from src.api import check_status
+from src.api.artifacts import ArtifactWriter
+from src.api.check_status import (
+    HALF_STAFF_BYTES,
+    HALF_STAFF_TERMS,
+    NATIONAL_ORDER_TERMS,
+    ORDER_TERMS,
+    FlagStatusChecker,
+    KnownOrderIndex,
+    TextExtractor,
+    parse_datetime,
+    scan_text,
+)
+from src.api.history_log import HistoryLog
+from src.api.status_store import StatusStore
 
 
 UTC = timezone.utc
@@ -17,6 +38,10 @@ class FakeResponse:
         self.content = content
         self._payload = payload
 
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
     def json(self):
         return self._payload
 
@@ -92,6 +117,46 @@ class KnownOrderTests(unittest.TestCase):
             self.assertIsNone(checker.check_known_orders())
 
 
+    def test_index_matches_linear_scan_over_large_registry(self):
+        orders = []
+        for day in range(0, 1000):
+            starts = datetime(2018, 1, 1, tzinfo=UTC) + timedelta(days=day, hours=day % 5)
+            orders.append(
+                {
+                    "id": f"order-{day}",
+                    "starts": starts.isoformat(),
+                    "expires": (starts + timedelta(days=day % 9 + 1)).isoformat(),
+                }
+            )
+        index = KnownOrderIndex(orders)
+        spans = [(parse_datetime(o["starts"]), parse_datetime(o["expires"]), o) for o in orders]
+        for hours in range(0, 1000 * 24, 23):
+            moment = datetime(2018, 1, 1, tzinfo=UTC) + timedelta(hours=hours)
+            active = [span for span in spans if span[0] <= moment < span[1]]
+            expected = max(active, key=lambda span: span[0], default=(None, None, None))[2]
+            self.assertEqual(index.active_at(moment), expected, moment)
+
+    def test_registry_is_reloaded_only_when_file_content_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            order_file = Path(directory) / "orders.json"
+            order = {
+                "starts": "2026-07-12T17:00:00Z",
+                "expires": "2026-07-18T22:00:00Z",
+                "reason": "First",
+                "source": "Official order",
+                "source_url": "https://example.gov/order",
+            }
+            order_file.write_text(json.dumps({"orders": [order]}), encoding="utf-8")
+            first = KnownOrderIndex.load(str(order_file))
+            self.assertIs(KnownOrderIndex.load(str(order_file)), first)
+
+            order_file.write_text(
+                json.dumps({"orders": [{**order, "reason": "Second"}]}), encoding="utf-8"
+            )
+            os.utime(order_file, ns=(first.mtime_ns + 1, first.mtime_ns + 1))
+            self.assertEqual(KnownOrderIndex.load(str(order_file)).active_at(NOW)["reason"], "Second")
+
+
 class BreakingNewsTests(unittest.TestCase):
     def test_detects_only_explicit_nationwide_order_and_parses_expiry(self):
         checker = FlagStatusChecker(now=NOW)
@@ -129,6 +194,57 @@ class BreakingNewsTests(unittest.TestCase):
             self.assertIsNone(checker.check_news_orders())
 
 
+    def test_duplicate_items_across_queries_are_scanned_once(self):
+        checker = FlagStatusChecker(now=NOW)
+        feed = rss("President orders all American flags lowered to half-staff")
+        with patch.object(checker, "_get", return_value=FakeResponse(feed)), patch(
+            "src.api.check_status.scan_text", wraps=scan_text
+        ) as scan:
+            candidates = list(checker._news_candidates())
+
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0]["link"], "https://example.com/story")
+        scan.assert_called_once()
+
+    def test_items_sharing_a_link_are_scanned_once_whatever_their_guids(self):
+        wrapped = "https://www.bing.com/news/apiclick.aspx?url=https%3A%2F%2Fexample.com%2Fa"
+        feed = b"".join(
+            f"<item><title>President orders all American flags lowered to half-staff</title>{guid}"
+            f"<link>{link}</link><pubDate>Sun, 12 Jul 2026 17:30:00 GMT</pubDate></item>".encode()
+            for guid, link in (
+                ("<guid>first-feed-1</guid>", wrapped),
+                ("<guid>second-feed-9</guid>", "https://example.com/a"),
+                ("", "https://example.com/a"),
+            )
+        )
+        feed = b"<?xml version='1.0'?><rss><channel>" + feed + b"</channel></rss>"
+        checker = FlagStatusChecker(now=NOW)
+        with patch.object(checker, "_get", return_value=FakeResponse(feed)), patch(
+            "src.api.check_status.scan_text", wraps=scan_text
+        ) as scan:
+            candidates = list(checker._news_candidates())
+            self.assertEqual(scan.call_count, 1)
+            checker.check_state_news()
+            self.assertEqual(scan.call_count, 2)
+
+        self.assertEqual(len(candidates), 1)
+
+    def test_stale_items_are_dropped_before_headline_scanning(self):
+        checker = FlagStatusChecker(now=NOW)
+        checker.news_queries = ("one query",)
+        old = b"""
+        <rss><channel><item>
+          <pubDate>Wed, 01 Jul 2026 12:00:00 GMT</pubDate>
+          <title>President orders all American flags lowered to half-staff</title>
+        </item></channel></rss>
+        """
+        with patch.object(checker, "_get", return_value=FakeResponse(old)), patch(
+            "src.api.check_status.scan_text"
+        ) as scan:
+            self.assertEqual(list(checker._news_candidates()), [])
+        scan.assert_not_called()
+
+
 class FailureSafetyTests(unittest.TestCase):
     def test_refuses_to_invent_full_staff_when_every_source_is_down(self):
         checker = FlagStatusChecker(now=NOW)
@@ -160,6 +276,40 @@ class FailureSafetyTests(unittest.TestCase):
         self.assertEqual(status["verification"], "retained-active-order")
 
 
+class DeadlineTests(unittest.TestCase):
+    def test_slow_source_is_marked_late_without_holding_up_result(self):
+        release = threading.Event()
+        checker = FlagStatusChecker(now=NOW)
+        checker.deadline_seconds = 0.2
+        checker._read_existing_status = lambda: None
+        checker.check_known_orders = lambda: None
+        checker.check_whitehouse_actions = lambda: release.wait(5) and None
+        checker.check_news_orders = lambda: None
+        checker.check_halfstaff_api = lambda: checker._signal(
+            "full-staff", "No notice", "HalfStaff.org", checker.halfstaff_url, priority=10
+        )
+
+        started = time.monotonic()
+        try:
+            status = checker.get_current_status()
+        finally:
+            release.set()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(status["status"], "full-staff")
+        self.assertIn(
+            {"name": "white-house", "available": False, "late": True}, status["checked_sources"]
+        )
+
+    def test_fetch_is_refused_once_deadline_has_passed(self):
+        checker = FlagStatusChecker(now=NOW)
+        checker.deadline = time.monotonic() - 1
+        with patch.object(checker.http, "get") as get:
+            with self.assertRaises(requests.Timeout):
+                checker._get("https://example.gov")
+        get.assert_not_called()
+
+
 class WhiteHouseTests(unittest.TestCase):
     def test_rejects_historical_order_without_future_expiration(self):
         checker = FlagStatusChecker(now=NOW)
@@ -167,11 +317,7 @@ class WhiteHouseTests(unittest.TestCase):
         The President ordered flags throughout the United States to be flown
         at half-staff for Memorial Day.
         """
-        with patch.object(
-            checker,
-            "_get",
-            return_value=type("Response", (), {"text": historical})(),
-        ):
+        with patch.object(checker, "_get", return_value=FakeResponse(historical.encode())):
             self.assertIsNone(checker._whitehouse_article_signal("https://example.gov/old"))
 
     def test_accepts_official_order_with_future_expiration(self):
@@ -180,16 +326,92 @@ class WhiteHouseTests(unittest.TestCase):
         The President ordered all American flags throughout the United States
         to be flown at half-staff until sunset, July 18, 2026.
         """
-        with patch.object(
-            checker,
-            "_get",
-            return_value=type("Response", (), {"text": current})(),
-        ):
+        with patch.object(checker, "_get", return_value=FakeResponse(current.encode())):
             signal = checker._whitehouse_article_signal("https://example.gov/current")
 
         self.assertEqual(signal["status"], "half-staff")
         self.assertEqual(parse_datetime(signal["expires"]).date().isoformat(), "2026-07-19")
 
+    def test_unchanged_article_verdict_is_reused_but_rechecked_against_clock(self):
+        current = """
+        The President ordered all American flags throughout the United States
+        to be flown at half-staff until sunset, July 18, 2026.
+        """
+        response = FakeResponse(current.encode())
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            checker.article_memo_file = str(Path(directory) / "articles.json")
+            with patch.object(checker, "_get", return_value=response):
+                self.assertIsNotNone(checker._whitehouse_article_signal("https://example.gov/o"))
+            checker._save_article_memo()
+
+            later = FlagStatusChecker(now=datetime(2026, 7, 20, tzinfo=UTC))
+            later.article_memo_file = checker.article_memo_file
+            with patch.object(later, "_get", return_value=response), patch(
+                "src.api.check_status.TextExtractor.extract"
+            ) as extract:
+                self.assertIsNone(later._whitehouse_article_signal("https://example.gov/o"))
+            extract.assert_not_called()
+
+    def test_listing_scan_fetches_only_new_or_possibly_active_articles(self):
+        listing = "".join(
+            f'<a href="/presidential-actions/2026/07/{slug}/">{slug}</a>'
+            for slug in ("old", "active", "new")
+        )
+        base = "https://www.whitehouse.gov/presidential-actions/2026/07/"
+        checker = FlagStatusChecker(now=NOW)
+        checker._articles = {
+            base + "old/": {"classified": "2026-07-12T12:00:00+00:00"},
+            base + "active/": {
+                "classified": "2026-07-12T12:00:00+00:00",
+                "expires": "2026-07-18T22:00:00+00:00",
+                "text": "...",
+            },
+        }
+        fetched = []
+        with patch.object(
+            checker, "_get", return_value=type("Response", (), {"text": listing})()
+        ), patch.object(checker, "_whitehouse_article_signal", side_effect=fetched.append):
+            checker.check_whitehouse_actions()
+
+        self.assertEqual(sorted(fetched), [base + "active/", base + "new/"])
+
+    def test_page_without_half_staff_wording_is_never_parsed(self):
+        checker = FlagStatusChecker(now=NOW)
+        checker._articles = {}
+        page = FakeResponse(b"<html><body><p>A proclamation on National Park Week</p></body></html>")
+        with patch.object(checker, "_get", return_value=page), patch(
+            "src.api.check_status.TextExtractor.extract"
+        ) as extract:
+            self.assertIsNone(checker._whitehouse_article_signal("https://example.gov/parks"))
+        extract.assert_not_called()
+
+    def test_byte_prefilter_admits_every_encoded_half_staff_spelling(self):
+        for markup in (
+            "half&#45;staff",
+            "half&#x2D;staff",
+            "Half<span> </span>Staff",
+            "half</p><p>staff",
+            "half&ensp;staff",
+            "half&#8201;staff",
+            "half&Tab;mast",
+            "half\u2009staff",
+        ):
+            html = f"<html><body><p>Flags at {markup} until sunset</p></body></html>"
+            text = BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+            self.assertTrue(HALF_STAFF_TERMS.search(text), markup)
+            self.assertTrue(HALF_STAFF_BYTES.search(html.encode("utf-8")), markup)
+
+    def test_streaming_extractor_matches_beautifulsoup_text(self):
+        html = (
+            "<html><head><title>Honoring a Senator</title><style>p{}</style></head>"
+            "<body><script>var x = 'half-staff';</script><p>Flags at half&nbsp;staff"
+            "</p><p>  until <b>sunset</b>, July 18 &amp; beyond </p></body></html>"
+        )
+        self.assertEqual(
+            TextExtractor.extract(html), BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+        )
+
     def test_parses_time_before_date_in_official_proclamation(self):
         checker = FlagStatusChecker(now=NOW)
         expires = checker._parse_expiration(
@@ -198,11 +420,36 @@ class WhiteHouseTests(unittest.TestCase):
         self.assertEqual(parse_datetime(expires), datetime(2026, 7, 18, 22, 0, tzinfo=UTC))
 
 
+class TextScannerTests(unittest.TestCase):
+    def test_phrase_flags_agree_with_individual_patterns(self):
+        samples = [
+            "President ORDERS all American flags lowered to Half-Mast",
+            "Governor directs flags at half staff statewide",
+            "Flags across the nation: all flags in the U.S. at halfstaff",
+            "Nationwide reorder of behalf-staffing",
+            "He was ordered; flags flown throughout the United States",
+        ]
+        for text in samples:
+            scan = scan_text(text)
+            self.assertEqual(scan["half_staff"], bool(HALF_STAFF_TERMS.search(text)), text)
+            self.assertEqual(scan["national"], bool(NATIONAL_ORDER_TERMS.search(text)), text)
+            self.assertEqual(scan["order"], bool(ORDER_TERMS.search(text)), text)
+
+    def test_explicit_date_takes_precedence_over_earlier_weekday_form(self):
+        checker = FlagStatusChecker(now=NOW)
+        expires = checker._parse_expiration(
+            "Flags fly at half-staff until Saturday at 6pm, and at federal sites "
+            "until sunset, July 20, 2026."
+        )
+        self.assertEqual(parse_datetime(expires), datetime(2026, 7, 21, 3, 59, tzinfo=UTC))
+
+
 class HistoryTests(unittest.TestCase):
     def test_same_status_enriches_existing_record_without_duplication(self):
         with tempfile.TemporaryDirectory() as directory:
             checker = FlagStatusChecker(now=NOW)
             checker.history_file = str(Path(directory) / "history.json")
+            checker.history_log = HistoryLog(str(Path(directory) / "history"))
             Path(checker.history_file).write_text(
                 json.dumps(
                     {
@@ -237,6 +484,435 @@ class HistoryTests(unittest.TestCase):
             self.assertEqual(history[0]["source"], "The White House")
             self.assertEqual(history[0]["ends"], "2026-07-18T22:00:00Z")
 
+    def test_unchanged_run_appends_nothing_and_log_outlives_published_cap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            checker.history_file = str(Path(directory) / "history.json")
+            checker.history_log = HistoryLog(str(Path(directory) / "history"))
+            checker.max_history_entries = 3
+            for index in range(5):
+                checker._append_history(
+                    {
+                        "last_updated": f"2026-07-0{index + 1}T00:00:00+00:00",
+                        "status": "half-staff" if index % 2 else "full-staff",
+                        "reason": f"Transition {index}",
+                        "source": "Official",
+                    }
+                )
+            segment = Path(checker.history_log.segments()[0])
+            size = segment.stat().st_size
+            checker._append_history(
+                {
+                    "last_updated": "2026-07-05T00:00:00+00:00",
+                    "status": "full-staff",
+                    "reason": "Transition 4",
+                    "source": "Official",
+                }
+            )
+
+            self.assertEqual(segment.stat().st_size, size)
+            self.assertEqual([record["seq"] for record in checker.history_log.records()], [1, 2, 3, 4, 5])
+            published = json.loads(Path(checker.history_file).read_text(encoding="utf-8"))
+            self.assertEqual(
+                [entry["reason"] for entry in published["history"]],
+                ["Transition 4", "Transition 3", "Transition 2"],
+            )
+
+    def test_change_feed_serves_entries_after_a_cursor_and_ignores_unchanged_runs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            checker.history_file = str(Path(directory) / "history.json")
+            checker.history_log = HistoryLog(str(Path(directory) / "history"))
+            checker.change_segment_size = 2
+            statuses = [
+                ("2026-07-01T00:00:00+00:00", "full-staff", "HalfStaff.org"),
+                ("2026-07-12T17:30:00+00:00", "half-staff", "News"),
+                ("2026-07-12T17:30:00+00:00", "half-staff", "The White House"),
+            ]
+            for date, status, source in statuses:
+                checker._append_history({"last_updated": date, "status": status, "source": source})
+            feed = Path(directory) / "changes"
+            head_bytes = (feed / "head.json").read_bytes()
+            checker._append_history(
+                {"last_updated": statuses[-1][0], "status": "half-staff", "source": "The White House"}
+            )
+
+            self.assertEqual((feed / "head.json").read_bytes(), head_bytes)
+            head = json.loads(head_bytes)
+            self.assertEqual(head["cursor"], 3)
+            self.assertEqual(head["latest"], "changes/3.json")
+            cursor = 1
+            segment = json.loads((feed / f"{cursor // 2 * 2 + 1}.json").read_text(encoding="utf-8"))
+            after = [change for change in segment["changes"] if change["seq"] > cursor]
+            self.assertEqual([(change["seq"], change["type"]) for change in after], [(2, "transition")])
+            latest = json.loads((feed / "3.json").read_text(encoding="utf-8"))
+            self.assertEqual([change["type"] for change in latest["changes"]], ["update"])
+
+    def test_full_history_is_sharded_into_stable_pages_with_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            checker.history_file = str(Path(directory) / "history.json")
+            checker.history_page_size = 2
+            checker.artifacts = ArtifactWriter(str(Path(directory) / "manifest.json"))
+            history = [
+                {"date": f"{year}-0{month}-01", "status": "full-staff", "reason": f"{year}-{month}"}
+                for year, month in ((2026, 3), (2026, 1), (2025, 9), (2025, 2), (2024, 5))
+            ]
+            checker._write_history_shards(history)
+            shards = Path(directory) / "history"
+            first_page = (shards / "page-1.json").read_bytes()
+
+            checker._write_history_shards(
+                [{"date": "2026-05-01", "status": "half-staff", "reason": "new"}] + history
+            )
+            index = json.loads((shards / "index.json").read_text(encoding="utf-8"))
+
+            self.assertEqual((shards / "page-1.json").read_bytes(), first_page)
+            self.assertEqual([page["count"] for page in index["pages"]], [2, 2, 2])
+            self.assertEqual(index["pages"][-1]["to"], "2026-05-01")
+            self.assertEqual(index["newest"], "2026-05-01")
+            self.assertEqual(index["oldest"], "2024-05-01")
+            self.assertEqual([year["year"] for year in index["years"]], [2024, 2025, 2026])
+            year = json.loads((shards / "years" / "2026.json").read_text(encoding="utf-8"))
+            self.assertEqual([entry["reason"] for entry in year["history"]], ["new", "2026-3", "2026-1"])
+
+            # Compaction that drops a year removes its shard and manifest entry.
+            checker.artifacts.save()
+            checker._write_history_shards(history[:2])
+            checker.artifacts.save()
+            self.assertEqual(sorted(os.listdir(shards / "years")), ["2026.json"])
+            manifest = json.loads(Path(checker.artifacts.manifest_file).read_text(encoding="utf-8"))
+            self.assertFalse([key for key in manifest["artifacts"] if "/years/2025" in key or "/years/2024" in key])
+
+    def test_undated_entries_are_paged_but_left_out_of_year_shards(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            checker.history_file = str(Path(directory) / "history.json")
+            checker.artifacts = ArtifactWriter(str(Path(directory) / "manifest.json"))
+            history = [
+                {"date": "2026-03-01", "status": "full-staff"},
+                {"status": "half-staff"},
+                {"date": "Sunday", "status": "full-staff"},
+            ]
+            with self.assertLogs("src.api.check_status", "WARNING"):
+                checker._write_history_shards(history)
+            index = json.loads((Path(directory) / "history" / "index.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(index["total"], 3)
+        self.assertEqual([(year["year"], year["count"]) for year in index["years"]], [(2026, 1)])
+        self.assertEqual(index["newest"], "2026-03-01")
+
+    def test_unchanged_output_file_is_not_rewritten(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            path = str(Path(directory) / "badge.json")
+            self.assertTrue(checker._write_json(path, {"message": "full-staff"}))
+            os.utime(path, ns=(0, 0))
+            self.assertFalse(checker._write_json(path, {"message": "full-staff"}))
+            self.assertEqual(os.stat(path).st_mtime_ns, 0)
+
+    def test_precompressed_siblings_are_deterministic(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            path = str(Path(directory) / "status.json")
+            checker._write_json(path, {"status": "half-staff"}, precompress=True)
+            first = Path(path + ".gz").read_bytes()
+            os.remove(path + ".gz")
+            checker.artifacts = ArtifactWriter(str(Path(directory) / "manifest.json"))
+            checker._write_json(path, {"status": "half-staff"}, precompress=True)
+
+            self.assertEqual(Path(path).read_bytes(), b'{"status":"half-staff"}\n')
+            self.assertEqual(gzip.decompress(first), Path(path).read_bytes())
+            self.assertEqual(Path(path + ".gz").read_bytes(), first)
+
+    def test_concurrent_manifest_saves_never_collide(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = ArtifactWriter(str(Path(directory) / "manifest.json"))
+            errors = []
+
+            def publish(worker):
+                try:
+                    for n in range(50):
+                        writer.write(str(Path(directory) / f"{worker}-{n}.json"), {"n": n})
+                        writer.save()
+                except Exception as error:  # pragma: no cover - the failure being tested for
+                    errors.append(error)
+
+            threads = [threading.Thread(target=publish, args=(worker,)) for worker in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            writer.save()
+
+            self.assertEqual(errors, [])
+            manifest = json.loads(Path(directory, "manifest.json").read_text(encoding="utf-8"))
+            self.assertEqual(len(manifest["artifacts"]), 200)
+            self.assertEqual([name for name in os.listdir(directory) if name.endswith(".tmp")], [])
+
+    def test_background_compaction_failures_are_logged(self):
+        checker = FlagStatusChecker(now=NOW)
+        future = checker._compactor.submit(lambda: 1 / 0)
+        with self.assertLogs(check_status.logger, "ERROR") as logs:
+            future.add_done_callback(checker._compaction_done)
+        checker._compactor.shutdown()
+        self.assertIn("compaction failed", logs.output[0])
+
+    def test_published_status_is_read_once_per_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            checker.api_status_file = str(Path(directory) / "status.json")
+            checker.history_file = str(Path(directory) / "history.json")
+            checker.badge_file = str(Path(directory) / "badge.json")
+            checker.history_log = HistoryLog(str(Path(directory) / "history"))
+            checker.artifacts = ArtifactWriter(str(Path(directory) / "manifest.json"))
+            checker.metrics_dir = str(Path(directory) / "metrics")
+            Path(checker.api_status_file).write_text(
+                json.dumps({"status": "full-staff", "last_updated": "2026-07-01T00:00:00+00:00"}),
+                encoding="utf-8",
+            )
+            for name in ("check_known_orders", "check_whitehouse_actions", "check_news_orders"):
+                setattr(checker, name, lambda: None)
+            checker.check_halfstaff_api = lambda: checker._signal(
+                "full-staff", "No notice", "HalfStaff.org", checker.halfstaff_url, priority=10
+            )
+
+            checker.update_status()
+            checker.now = NOW + timedelta(minutes=15)
+            with patch("builtins.open", wraps=open) as opened:
+                checker.update_status()
+
+            reads = [call for call in opened.call_args_list if call.args[0] == checker.api_status_file]
+            self.assertEqual(len(reads), 1)
+            manifest = json.loads(Path(directory, "manifest.json").read_text(encoding="utf-8"))
+            self.assertIn(checker.badge_file.replace(os.sep, "/"), manifest["artifacts"])
+
+
+class MetricsTests(unittest.TestCase):
+    def _checker(self, directory):
+        checker = FlagStatusChecker(now=NOW)
+        checker.api_status_file = str(Path(directory) / "status.json")
+        checker.history_file = str(Path(directory) / "history.json")
+        checker.badge_file = str(Path(directory) / "badge.json")
+        checker.history_log = HistoryLog(str(Path(directory) / "history"))
+        checker.artifacts = ArtifactWriter(str(Path(directory) / "manifest.json"))
+        checker.metrics_dir = str(Path(directory) / "metrics")
+        checker.check_known_orders = lambda: None
+        checker.check_whitehouse_actions = lambda: None
+
+        def news():
+            checker._count_items("breaking-news", "items", 12)
+            time.sleep(0.01)
+
+        def halfstaff():
+            checker._count_items("halfstaff-org", "notices", 0)
+            return checker._signal("full-staff", "No notice", "HalfStaff.org", checker.halfstaff_url, priority=10)
+
+        checker.check_news_orders = news
+        checker.check_halfstaff_api = halfstaff
+        return checker
+
+    def test_checked_sources_record_time_transfer_and_items(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = self._checker(directory)
+            stats = {"halfstaff-org": {"requests": 1, "bytes": 42, "statuses": {"200": 1}, "repeat_fetches": 0}}
+            with patch.object(checker.http, "source_stats", return_value=stats):
+                status = checker.update_status()
+            prometheus = Path(directory, "metrics", "flag_status.prom").read_text(encoding="utf-8")
+            log = Path(directory, "metrics", "metrics.jsonl").read_text(encoding="utf-8").splitlines()
+
+        sources = {source["name"]: source for source in status["checked_sources"]}
+        self.assertEqual(sources["halfstaff-org"]["bytes"], 42)
+        self.assertEqual(sources["halfstaff-org"]["statuses"], {"200": 1})
+        self.assertEqual(sources["breaking-news"]["items"], {"items": 12})
+        self.assertGreaterEqual(sources["breaking-news"]["seconds"], 0.01)
+        self.assertIn('flag_status_source_bytes{source="halfstaff-org"} 42', prometheus)
+        self.assertIn('flag_status_source_items{source="breaking-news",kind="items"} 12', prometheus)
+        self.assertIn('flag_status_source_repeat_fetches{source="halfstaff-org"} 0', prometheus)
+        self.assertEqual(len(log), 1)
+        self.assertEqual(json.loads(log[0])["sources"], status["checked_sources"])
+
+    def test_metrics_alone_do_not_rewrite_status_within_the_hour(self):
+        for use_store in (False, True):
+            with self.subTest(store=use_store), tempfile.TemporaryDirectory() as directory:
+                store = StatusStore(str(Path(directory) / "status.db")) if use_store else None
+                writes = []
+                for minutes in (0, 15, 30):
+                    # A fresh checker per run, as with separate scheduled processes.
+                    checker = self._checker(directory)
+                    checker.store = store
+                    checker.now = NOW + timedelta(minutes=minutes)
+                    stats = {
+                        "halfstaff-org": {"requests": 1, "bytes": 100 + minutes, "statuses": {}, "repeat_fetches": 0}
+                    }
+                    with patch.object(checker.http, "source_stats", return_value=stats):
+                        checker.update_status()
+                    writes.append(checker.api_status_file.replace(os.sep, "/") in checker.artifacts.written)
+                if store:
+                    self.assertEqual(
+                        store.current_status(),
+                        json.loads(Path(checker.api_status_file).read_text(encoding="utf-8")),
+                    )
+                    store.close()
+
+                self.assertEqual(writes, [True, False, False])
+                self.assertEqual(
+                    len(Path(directory, "metrics", "metrics.jsonl").read_text(encoding="utf-8").splitlines()), 3
+                )
+
+
+class StateTests(unittest.TestCase):
+    FEDERAL = {
+        "status": "full-staff",
+        "reason": "No active notice reported by HalfStaff.org",
+        "source": "HalfStaff.org",
+        "source_url": "https://halfstaff.org/wp-json/halfstaff/v1/widget",
+        "expires": None,
+        "verification": "negative-provider-signal",
+    }
+
+    def _checker(self, directory, orders=()):
+        checker = FlagStatusChecker(now=NOW)
+        checker.api_status_file = str(Path(directory) / "status.json")
+        checker.artifacts = ArtifactWriter(str(Path(directory) / "manifest.json"))
+        checker.known_orders_file = str(Path(directory) / "orders.json")
+        Path(checker.known_orders_file).write_text(json.dumps({"orders": list(orders)}), encoding="utf-8")
+        return checker
+
+    def test_shared_feeds_are_fetched_once_and_credited_per_state(self):
+        feed = rss(
+            "Governor orders South Carolina and Georgia flags at half-staff to honor Graham",
+        ).replace(
+            b"</channel>",
+            b"<item><title>Mayor orders Washington, D.C. flags lowered to half-staff</title>"
+            b"<link>https://example.com/dc</link>"
+            b"<pubDate>Sun, 12 Jul 2026 16:00:00 GMT</pubDate></item></channel>",
+        )
+        texas_order = {
+            "id": "texas-2026",
+            "jurisdictions": ["TX"],
+            "starts": "2026-07-12T00:00:00Z",
+            "expires": "2026-07-13T00:00:00Z",
+            "reason": "Texas order",
+            "source": "Office of the Governor",
+            "source_url": "https://gov.texas.gov/order",
+        }
+        fetched = []
+
+        def fake_get(url, **kwargs):
+            fetched.append(url)
+            if "params" in kwargs:
+                return FakeResponse(feed)
+            return FakeResponse(payload={"type": "none"})
+
+        with tempfile.TemporaryDirectory() as directory:
+            checker = self._checker(directory, [texas_order])
+            with patch.object(checker, "_get", side_effect=fake_get):
+                states = checker.update_states(self.FEDERAL)
+            index = json.loads(Path(checker.states_dir, "index.json").read_text(encoding="utf-8"))
+            texas = json.loads(Path(checker.states_dir, "TX.json").read_text(encoding="utf-8"))
+
+            self.assertIsNone(checker.check_known_orders())
+
+        self.assertEqual(len(states), 51)
+        self.assertEqual(fetched.count(checker.news_url), len(checker.state_news_queries))
+        self.assertEqual(index["half_staff"], ["GA", "SC", "TX", "DC"])
+        self.assertEqual(states["SC"]["verification"], "state-order-headline")
+        self.assertEqual(states["WA"]["status"], "full-staff")
+        self.assertEqual(texas["verification"], "verified-order")
+        self.assertEqual(texas["checked_sources"][1], {"name": "known-orders", "available": True})
+
+    def test_outlets_people_and_descriptions_do_not_credit_states(self):
+        feed = (
+            b"<?xml version='1.0'?><rss><channel>"
+            b"<item><title>Governor orders flags at half-staff for George Washington Carver"
+            b" - Washington Post</title><link>https://example.com/1</link>"
+            b"<description>The New York Times first reported the order in Ohio.</description>"
+            b"<pubDate>Sun, 12 Jul 2026 17:30:00 GMT</pubDate></item>"
+            b"<item><title>New York Times: governor orders Oregon flags lowered to half-staff</title>"
+            b"<link>https://example.com/2</link>"
+            b"<pubDate>Sun, 12 Jul 2026 17:30:00 GMT</pubDate></item>"
+            b"</channel></rss>"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            checker = self._checker(directory)
+            with patch.object(checker, "_get", return_value=FakeResponse(feed)):
+                found = checker.check_state_news()
+
+        self.assertEqual(sorted(found), ["OR"])
+
+    def test_active_federal_order_applies_to_every_state(self):
+        federal = {
+            **self.FEDERAL,
+            "status": "half-staff",
+            "reason": "Presidential order",
+            "expires": "2026-07-18T22:00:00Z",
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            checker = self._checker(directory)
+            checker.check_state_news = lambda: {}
+            with patch.object(checker, "_get", return_value=FakeResponse(payload={"type": "none"})):
+                states = checker.update_states(federal)
+
+        self.assertEqual({state["status"] for state in states.values()}, {"half-staff"})
+        self.assertEqual(states["CA"]["verification"], "federal-order")
+
+    def test_state_failures_do_not_block_the_federal_publication(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = self._checker(directory)
+            checker.history_file = str(Path(directory) / "history.json")
+            checker.badge_file = str(Path(directory) / "badge.json")
+            checker.history_log = HistoryLog(str(Path(directory) / "history"))
+            checker.metrics_dir = str(Path(directory) / "metrics")
+            checker.include_states = True
+            checker.check_known_orders = checker.check_whitehouse_actions = checker.check_news_orders = lambda: None
+            checker.check_halfstaff_api = lambda: checker._signal(
+                "full-staff", "No notice", "HalfStaff.org", checker.halfstaff_url, priority=10
+            )
+            with patch.object(checker, "update_states", side_effect=ValueError("bad date")), self.assertLogs(
+                "src.api.check_status", "ERROR"
+            ):
+                checker.update_status()
+            manifest = json.loads(Path(directory, "manifest.json").read_text(encoding="utf-8"))
+
+        self.assertIn(checker.api_status_file.replace(os.sep, "/"), manifest["artifacts"])
+
+    def test_states_only_resolves_against_the_published_federal_status(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = self._checker(directory)
+            checker.check_state_news = lambda: {}
+            with self.assertRaises(RuntimeError):
+                checker.publish_states()
+            Path(checker.api_status_file).write_text(
+                json.dumps({**self.FEDERAL, "status": "half-staff", "expires": "2026-07-18T22:00:00Z"}),
+                encoding="utf-8",
+            )
+            checker = self._checker(directory)
+            checker.check_state_news = lambda: {}
+            with patch.object(checker, "_get", return_value=FakeResponse(payload={"type": "none"})):
+                states = checker.publish_states()
+            manifest = json.loads(Path(directory, "manifest.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(states["OH"]["status"], "half-staff")
+        self.assertIn(os.path.join(checker.states_dir, "index.json").replace(os.sep, "/"), manifest["artifacts"])
+
+
+class DaemonTests(unittest.TestCase):
+    def test_daemon_reuses_one_checker_and_advances_its_clock(self):
+        stop = threading.Event()
+        seen = []
+
+        def update_status(checker):
+            seen.append((id(checker), checker.now))
+            if len(seen) == 2:
+                stop.set()
+
+        with patch.object(FlagStatusChecker, "update_status", update_status):
+            check_status.run_daemon(0, stop)
+
+        self.assertEqual(len({checker for checker, _ in seen}), 1)
+        self.assertLessEqual(seen[0][1], seen[1][1])
+
 
 if __name__ == "__main__":
     unittest.main()
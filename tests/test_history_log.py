@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.api import history_log
+from src.api.history_log import HistoryLog
+
+
+NOW = datetime(2026, 7, 12, 18, 0, tzinfo=timezone.utc)
+
+
+class HistoryLogTests(unittest.TestCase):
+    def test_tail_of_reopened_log_reads_only_the_last_record(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log = HistoryLog(directory)
+            for index in range(50):
+                log.append({"status": "full-staff", "reason": f"entry {index}"}, NOW)
+
+            reopened = HistoryLog(directory)
+            self.assertEqual(reopened.tail()["seq"], 50)
+            self.assertEqual(reopened.tail()["entry"]["reason"], "entry 49")
+            self.assertEqual(
+                history_log._last_line(reopened.segments()[0], block_size=7),
+                history_log._last_line(reopened.segments()[0]),
+            )
+
+    def test_torn_final_line_is_skipped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log = HistoryLog(directory)
+            log.append({"status": "half-staff"}, NOW)
+            segment = Path(log.segments()[0])
+            with segment.open("a", encoding="utf-8") as handle:
+                handle.write('{"seq": 2, "entr')
+
+            reopened = HistoryLog(directory)
+            self.assertEqual(reopened.tail()["seq"], 1)
+            reopened.append({"status": "full-staff"}, NOW)
+            self.assertEqual([record["seq"] for record in reopened.records()], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
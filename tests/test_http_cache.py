@@ -0,0 +1,78 @@
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.api.http_cache import HttpCache
+from src.api.http_session import HttpSession
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"<html>proclamation</html>"
+    full_responses = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        type(self).full_responses += 1
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpCacheTests(unittest.TestCase):
+    def test_revalidated_response_is_served_from_disk(self):
+        ETagHandler.full_responses = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/article"
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                first = HttpSession(cache=HttpCache(directory))
+                first.get(url, source="white-house")
+                first.close()
+
+                # A new session reloads the persisted index, like the next run.
+                second = HttpSession(cache=HttpCache(directory))
+                response = second.get(url, source="white-house")
+                second.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, "<html>proclamation</html>")
+        self.assertEqual(ETagHandler.full_responses, 1)
+        self.assertEqual(second.source_cache_stats(), {"white-house": {"hits": 1, "misses": 0}})
+
+    def test_evicts_least_recently_used_entries_beyond_size_bound(self):
+        class Stored:
+            status_code = 200
+            headers = {"ETag": '"x"'}
+            content = b"x" * 10
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = HttpCache(directory, max_bytes=25)
+            cache.store("https://example.gov/a", Stored())
+            cache.store("https://example.gov/b", Stored())
+            cache.revive("https://example.gov/a", Stored(), cache.lookup("https://example.gov/a"))
+            cache.store("https://example.gov/c", Stored())
+
+            self.assertIsNotNone(cache.lookup("https://example.gov/a"))
+            self.assertIsNone(cache.lookup("https://example.gov/b"))
+            self.assertIsNotNone(cache.lookup("https://example.gov/c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from src.api.http_session import HttpSession
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_second_request_reuses_pooled_connection(self):
+        session = HttpSession()
+        try:
+            self.assertEqual(session.get(self.url).text, "ok")
+            session.get(self.url)
+        finally:
+            session.close()
+
+        self.assertEqual([record["reused"] for record in session.requests], [False, True])
+        host = f"127.0.0.1:{self.server.server_port}"
+        self.assertEqual(session.stats(), {host: {"requests": 2, "reused": 1}})
+
+    def test_source_stats_count_bytes_statuses_and_repeat_fetches(self):
+        session = HttpSession()
+        try:
+            session.get(self.url, source="white-house", params={"page": 1})
+            session.get(self.url, source="white-house", params={"page": 2})
+            session.get(self.url, source="white-house", params={"page": 1})
+            session.get(self.url, source="breaking-news")
+        finally:
+            session.close()
+
+        self.assertEqual(
+            session.source_stats()["white-house"],
+            {"requests": 3, "bytes": 6, "statuses": {"200": 3}, "repeat_fetches": 1},
+        )
+        self.assertEqual(session.source_stats()["breaking-news"]["repeat_fetches"], 0)
+
+    def test_budget_caps_split_timeouts(self):
+        session = HttpSession(connect_timeout=5, read_timeout=15)
+        with patch.object(session._session, "get", wraps=session._session.get) as get:
+            session.get(self.url, budget=2)
+        self.assertEqual(get.call_args.kwargs["timeout"], (2, 2))
+        session.close()
+
+    def test_unbounded_budget_waits_for_a_contended_slot(self):
+        session = HttpSession(max_per_host=1)
+        limit = session._host_limit(f"127.0.0.1:{self.server.server_port}")
+        limit.acquire()
+        threading.Timer(0.05, limit.release).start()
+        try:
+            self.assertEqual(session.get(self.url, budget=float("inf")).text, "ok")
+        finally:
+            session.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
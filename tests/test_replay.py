@@ -0,0 +1,51 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.api.check_status import FlagStatusChecker
+from src.api.replay import moments_between, replay
+
+UTC = timezone.utc
+HALFSTAFF_URL = FlagStatusChecker().halfstaff_url
+
+
+def capture(root, name, widget):
+    directory = Path(root) / name
+    directory.mkdir()
+    (directory / "halfstaff.json").write_text(json.dumps(widget), encoding="utf-8")
+    (directory / "index.json").write_text(
+        json.dumps({HALFSTAFF_URL: "halfstaff.json"}), encoding="utf-8"
+    )
+
+
+class ReplayTests(unittest.TestCase):
+    def test_replays_timeline_from_newest_capture_at_each_moment(self):
+        with tempfile.TemporaryDirectory() as root:
+            capture(root, "2026-07-12T00-00-00Z", {"type": "none"})
+            capture(
+                root,
+                "2026-07-12T03-00-00Z",
+                {"type": "notice", "title": "Honoring a governor", "expires": "2026-07-20T00:00:00Z"},
+            )
+            orders = Path(root) / "orders.json"
+            orders.write_text(json.dumps({"orders": []}), encoding="utf-8")
+            moments = moments_between(
+                datetime(2026, 7, 11, 23, tzinfo=UTC),
+                datetime(2026, 7, 12, 6, tzinfo=UTC),
+                timedelta(hours=1),
+            )
+
+            result = replay(root, moments, workers=2, known_orders_file=str(orders), warmup_steps=2)
+
+        statuses = [entry["status"] for entry in result["timeline"]]
+        self.assertEqual(statuses, [None] + ["full-staff"] * 3 + ["half-staff"] * 4)
+        self.assertEqual(result["summary"]["evaluations"], 8)
+        self.assertEqual(result["summary"]["transitions"], 3)
+        self.assertEqual(result["timeline"][4]["capture"], "2026-07-12T03-00-00Z")
+        self.assertIn("white-house", result["timeline"][4]["unavailable"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,404 @@
+import gzip
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from server import (
+    ArtifactStore,
+    EventBroker,
+    FaultProfile,
+    FlagStatusHandler,
+    HistoryIndex,
+    HistoryQueries,
+    SourceFixtures,
+    make_artifact_server,
+    make_source_simulator,
+    parse_history_query,
+    parse_latency,
+)
+from src.api import check_status
+from src.api.check_status import FlagStatusChecker
+from src.api.http_cache import HttpCache
+from src.api.http_session import HttpSession
+
+NOW = datetime(2026, 7, 12, 18, 0, tzinfo=timezone.utc)
+ARTICLE = "https://www.whitehouse.gov/presidential-actions/2026/07/honoring-senator/"
+
+
+def record(directory):
+    checker = FlagStatusChecker(now=NOW)
+    files = {
+        checker.halfstaff_url: ("halfstaff.json", json.dumps({"type": "none"})),
+        checker.whitehouse_url: ("listing.html", f'<html><a href="{ARTICLE}">Honoring</a></html>'),
+        ARTICLE: (
+            "article.html",
+            "<html><p>I hereby order that the flag shall be flown at half-staff throughout "
+            "the United States until sunset, July 18, 2026, to honor Senator Graham.</p></html>",
+        ),
+    }
+    for name, body in files.values():
+        Path(directory, name).write_text(body, encoding="utf-8")
+    Path(directory, "index.json").write_text(
+        json.dumps({url: name for url, (name, _) in files.items()}), encoding="utf-8"
+    )
+
+
+class SourceSimulatorTests(unittest.TestCase):
+    def serve(self, directory, faults):
+        server = make_source_simulator(("127.0.0.1", 0), SourceFixtures(directory), faults)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_port}", server
+
+    def test_checker_resolves_from_recorded_sources_and_revalidates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            record(directory)
+            base, server = self.serve(directory, FaultProfile(latency="uniform:1:5", seed=1))
+            cache = HttpCache(str(Path(directory) / "cache"))
+            for _ in range(2):
+                checker = FlagStatusChecker(now=NOW, http=HttpSession(cache=cache))
+                checker.use_source_base(base)
+                checker._articles = {}
+                checker.check_news_orders = lambda: None
+                checker.known_orders_file = str(Path(directory) / "missing.json")
+                status = checker.get_current_status()
+
+        self.assertEqual(status["status"], "half-staff")
+        self.assertEqual(status["source_url"], base + "/presidential-actions/2026/07/honoring-senator/")
+        self.assertEqual(server.RequestHandlerClass.stats["not_modified"], 3)
+
+    def test_simulated_runs_publish_outside_the_repository(self):
+        with tempfile.TemporaryDirectory() as directory:
+            record(directory)
+            base, _ = self.serve(directory, FaultProfile())
+            checker = FlagStatusChecker(now=NOW, http=HttpSession(cache=HttpCache(str(Path(directory) / "c"))))
+            with patch.object(check_status, "SIMULATED_OUTPUT_ROOT", str(Path(directory) / "out")):
+                check_status._configure(checker, base, None, None)
+            checker.check_news_orders = lambda: None
+            published = Path("public", "api", "status.json").read_bytes()
+            checker.update_status()
+            checker._compactor.shutdown()
+
+            status = json.loads(Path(directory, "out", "public", "api", "status.json").read_text(encoding="utf-8"))
+            self.assertEqual(status["status"], "half-staff")
+            self.assertTrue(Path(directory, "out", "src", "api", "history").is_dir())
+            self.assertTrue(Path(directory, "out", ".cache", "flag-status", "metrics", "flag_status.prom").exists())
+            self.assertEqual(Path(checker.http.cache.directory).parent, Path(directory, "out", ".cache", "flag-status"))
+        self.assertEqual(Path("public", "api", "status.json").read_bytes(), published)
+
+    def test_injected_faults_make_sources_unavailable(self):
+        with tempfile.TemporaryDirectory() as directory:
+            record(directory)
+            for faults in (FaultProfile(error_rate=1.0), FaultProfile(truncate_rate=1.0)):
+                base, _ = self.serve(directory, faults)
+                checker = FlagStatusChecker(now=NOW, http=HttpSession())
+                checker.use_source_base(base)
+                self.assertIsNone(checker.check_halfstaff_api())
+
+    def test_latency_specs_are_seeded_and_validated(self):
+        first = FaultProfile(latency="lognormal:100:0.5", seed=3)
+        second = FaultProfile(latency="lognormal:100:0.5", seed=3)
+        self.assertEqual([first.draw() for _ in range(5)], [second.draw() for _ in range(5)])
+        with self.assertRaises(ValueError):
+            parse_latency("gamma:1")
+
+
+class ArtifactServerTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        (self.root / "api").mkdir()
+        (self.root / "api" / "status.json").write_text('{"status":"full-staff"}\n', encoding="utf-8")
+        (self.root / "badge.json").write_text('{"message":"full-staff"}\n', encoding="utf-8")
+        (self.root / "secret.json").write_text("{}", encoding="utf-8")
+        self.store = ArtifactStore(str(self.root), recheck=0)
+        server = make_artifact_server(("127.0.0.1", 0), self.store)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        self.addCleanup(self.connection.close)
+
+    def fetch(self, path, **headers):
+        self.connection.request("GET", path, headers=headers)
+        response = self.connection.getresponse()
+        return response.status, response.read()
+
+    def test_serves_artifacts_over_one_connection_and_reloads_on_mtime_change(self):
+        self.assertEqual(self.fetch("/api/status"), (200, b'{"status":"full-staff"}\n'))
+        self.assertEqual(self.fetch("/badge.json")[0], 200)
+        self.assertEqual(self.fetch("/api/status.json")[1], b'{"status":"full-staff"}\n')
+        self.assertEqual(self.store.reloads, 2)
+
+        status = self.root / "api" / "status.json"
+        status.write_text('{"status":"half-staff"}\n', encoding="utf-8")
+        stat = status.stat()
+        os.utime(status, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(self.fetch("/api/status"), (200, b'{"status":"half-staff"}\n'))
+        self.assertEqual(self.store.reloads, 3)
+
+    def test_revalidates_by_etag_and_serves_precompressed_siblings(self):
+        history = json.dumps({"history": [{"reason": f"Observance {n}"} for n in range(50)]}).encode()
+        (self.root / "api" / "history.json").write_bytes(history)
+        # A lower level than the server's own gzip, so the sibling is recognizable.
+        sibling = gzip.compress(history, compresslevel=1, mtime=0)
+        (self.root / "api" / "history.json.gz").write_bytes(sibling)
+
+        self.connection.request("GET", "/api/history", headers={"Accept-Encoding": "gzip, br;q=0"})
+        response = self.connection.getresponse()
+        self.assertEqual(response.read(), sibling)
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(response.getheader("Content-Length"), str(len(sibling)))
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        etag = response.getheader("ETag")
+
+        self.connection.request("GET", "/api/history", headers={"If-None-Match": etag})
+        response = self.connection.getresponse()
+        self.assertEqual((response.status, response.read()), (304, b""))
+        self.assertEqual(self.fetch("/api/history", **{"Accept-Encoding": "identity"}), (200, history))
+
+    def test_compresses_on_the_first_request_that_wants_it(self):
+        history = json.dumps({"history": [{"reason": f"Observance {n}"} for n in range(50)]}).encode()
+        (self.root / "api" / "history.json").write_bytes(history)
+
+        self.assertEqual(self.fetch("/api/history", **{"Accept-Encoding": "identity"}), (200, history))
+        response = self.store.get("api/history.json").response
+        self.assertEqual(set(response.variants), {"identity"})
+
+        self.connection.request("GET", "/api/history", headers={"Accept-Encoding": "gzip, br;q=0"})
+        reply = self.connection.getresponse()
+        self.assertEqual(gzip.decompress(reply.read()), history)
+        self.assertIs(self.store.get("api/history.json").response, response)
+        self.assertIn("gzip", response.variants)
+        self.connection.request(
+            "GET", "/api/history", headers={"Accept-Encoding": "gzip, br;q=0", "If-None-Match": reply.getheader("ETag")}
+        )
+        reply = self.connection.getresponse()
+        self.assertEqual((reply.status, reply.read()), (304, b""))
+
+    def write_shards(self, days):
+        entries = [
+            {"date": f"2026-07-{day:02d}T12:00:00+00:00", "status": "half-staff" if day % 2 else "full-staff"}
+            for day in range(1, days + 1)
+        ]
+        shards = self.root / "api" / "history"
+        shards.mkdir(exist_ok=True)
+        pages = []
+        for number, start in enumerate(range(0, days, 4), start=1):
+            page = list(reversed(entries[start : start + 4]))
+            (shards / f"page-{number}.json").write_text(json.dumps({"history": page}), encoding="utf-8")
+            pages.append({"page": number, "path": f"history/page-{number}.json"})
+        (shards / "index.json").write_text(json.dumps({"total": days, "pages": pages}), encoding="utf-8")
+
+    def test_queries_the_full_sharded_history(self):
+        self.write_shards(10)
+        dates, cursor = [], ""
+        while cursor is not None:
+            status, body = self.fetch(f"/api/history/query?status=half-staff&limit=2&cursor={cursor}")
+            self.assertEqual(status, 200)
+            page = json.loads(body)
+            dates += [entry["date"][8:10] for entry in page["history"]]
+            cursor = page["next_cursor"]
+        self.assertEqual(dates, ["09", "07", "05", "03", "01"])
+        self.assertEqual(self.fetch("/api/history/query?limit=500")[0], 400)
+
+    def test_history_index_is_rebuilt_only_for_a_new_shard_index(self):
+        self.write_shards(10)
+        queries = HistoryQueries(self.store)
+        first = queries.response("status=half-staff")
+        index = queries.index
+        self.assertIs(queries.response("status=half-staff"), first)
+        self.assertEqual(len(self.store), 1)  # pages are read directly, not held encoded
+
+        self.write_shards(11)
+        page = json.loads(queries.response("status=half-staff").body)
+        self.assertIsNot(queries.index, index)
+        self.assertEqual(page["total_entries"], 11)
+        self.assertEqual(page["history"][0]["date"][8:10], "11")
+
+    def test_rejects_paths_outside_the_published_artifacts(self):
+        for path in ("/secret.json", "/api/../secret.json", "/api/history.json"):
+            self.assertEqual(self.fetch(path)[0], 404, path)
+
+
+class EventStreamTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        (self.root / "api" / "changes").mkdir(parents=True)
+        self.publish({"status": "full-staff", "reason": "No active notices", "last_checked": "17:00"}, [])
+        store = ArtifactStore(str(self.root), recheck=0)
+        self.broker = EventBroker(store, poll=0.02, heartbeat=0.2)
+        self.broker.start()
+        self.addCleanup(self.broker.close)
+        server = make_artifact_server(("127.0.0.1", 0), store, self.broker)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.port = server.server_port
+
+    def publish(self, status, changes):
+        api = self.root / "api"
+        for name, data in (
+            ("status.json", status),
+            ("changes/1.json", {"from": 1, "to": 100, "changes": changes}),
+            ("changes/head.json", {"cursor": len(changes), "segment_size": 100}),
+        ):
+            path = api / name
+            previous = path.stat().st_mtime_ns if path.exists() else 0
+            path.write_text(json.dumps(data), encoding="utf-8")
+            os.utime(path, ns=(previous + 10**9, previous + 10**9))
+
+    def subscribe(self, last_event_id=None):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        self.addCleanup(connection.close)
+        headers = {"Last-Event-ID": last_event_id} if last_event_id else {}
+        connection.request("GET", "/api/events", headers=headers)
+        response = connection.getresponse()
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+        return response
+
+    def next_event(self, response):
+        fields = {}
+        while True:
+            line = response.readline().decode("utf-8").rstrip("\n")
+            if not line and fields:
+                return fields
+            if line.startswith(":"):
+                fields[":"] = line[1:].strip()
+            elif line and not line.startswith("retry:"):
+                name, _, value = line.partition(": ")
+                fields[name] = value
+
+    def test_pushes_status_and_history_only_when_the_status_changes(self):
+        stream = self.subscribe()
+        first = self.next_event(stream)
+        self.assertEqual((first["event"], json.loads(first["data"])["status"]), ("status", "full-staff"))
+
+        # A run that only moves last_checked is not an event; the heartbeat is.
+        self.publish({"status": "full-staff", "reason": "No active notices", "last_checked": "18:00"}, [])
+        self.assertEqual(self.next_event(stream), {":": "heartbeat"})
+
+        change = {"seq": 1, "type": "transition", "entry": {"status": "half-staff"}}
+        self.publish({"status": "half-staff", "reason": "Honoring a senator"}, [change])
+        status, history = self.next_event(stream), self.next_event(stream)
+        self.assertEqual(json.loads(status["data"])["reason"], "Honoring a senator")
+        self.assertEqual((history["event"], json.loads(history["data"])), ("history", change))
+        self.assertTrue(history["id"].startswith("1:"))
+        self.assertEqual(len(self.broker.subscribers), 1)
+
+    def test_resumes_from_last_event_id(self):
+        digest = self.next_event(self.subscribe())["id"].split(":")[1]
+        changes = [
+            {"seq": 1, "type": "transition", "entry": {"status": "half-staff"}},
+            {"seq": 2, "type": "update", "entry": {"status": "half-staff", "ends": "2026-07-18"}},
+        ]
+        self.publish({"status": "full-staff", "reason": "No active notices"}, changes)
+        time.sleep(0.1)
+
+        # Same status as the client last saw: only the missed history is replayed.
+        stream = self.subscribe(f"1:{digest}")
+        event = self.next_event(stream)
+        self.assertEqual((event["event"], event["id"]), ("history", f"2:{digest}"))
+        self.assertEqual(self.next_event(stream), {":": "heartbeat"})
+
+
+class HistoryIndexTests(unittest.TestCase):
+    def setUp(self):
+        sources = ("HalfStaff.org", "The White House", "Breaking news")
+        self.entries = [
+            {
+                "id": f"order-{n // 3}",
+                "date": f"{2020 + n // 100}-{n % 12 + 1:02d}-{n % 28 + 1:02d}T00:00:00+00:00",
+                "status": ("half-staff", "full-staff")[n % 2],
+                "source": sources[n % 3],
+                "verification": "official-presidential-action" if n % 5 == 0 else None,
+            }
+            for n in range(500)
+        ]
+        self.entries.sort(key=lambda entry: entry["date"], reverse=True)
+        self.index = HistoryIndex(self.entries)
+
+    def walk(self, query):
+        arguments = parse_history_query(query)
+        results = []
+        while True:
+            entries, cursor = self.index.query(**arguments)
+            results += entries
+            if cursor is None:
+                return results
+            arguments["cursor"] = cursor
+
+    def test_filters_and_pages_match_a_full_scan(self):
+        for query in (
+            "status=half-staff&source=halfstaff.org&limit=7",
+            "verification=official-presidential-action&from=2021-01-01&to=2022-06-30&limit=5",
+            "order_id=order-40&limit=1",
+            "status=full-staff&from=2023-03-01T00:00:00Z&limit=100",
+            "source=Nowhere",
+        ):
+            arguments = parse_history_query(query)
+            expected = [
+                entry
+                for entry in self.entries
+                if all(
+                    str(entry.get({"order_id": "id"}.get(name, name))).casefold() == value.casefold()
+                    for name, value in arguments["filters"].items()
+                )
+                and arguments.get("since", float("-inf"))
+                <= datetime.fromisoformat(entry["date"]).timestamp()
+                <= arguments.get("until", float("inf"))
+            ]
+            self.assertEqual(self.walk(query), expected, query)
+
+    def test_cursors_survive_newer_entries(self):
+        first, cursor = self.index.query(limit=10)
+        self.assertEqual(first, self.entries[:10])
+        newer = {"date": "2030-01-01T00:00:00+00:00", "status": "half-staff", "source": "HalfStaff.org"}
+        reloaded = HistoryIndex([newer] + self.entries)
+        self.assertEqual(reloaded.query(limit=10, cursor=cursor)[0], self.entries[10:20])
+
+    def test_rejects_malformed_queries(self):
+        for query in ("limit=0", "cursor=abc", "from=yesterday"):
+            with self.assertRaises(ValueError):
+                parse_history_query(query)
+
+
+class MockServerTests(unittest.TestCase):
+    def test_history_pages_are_encoded_once_and_revalidated(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FlagStatusHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        def fetch(**headers):
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+            try:
+                connection.request("GET", "/api/history?page=2&limit=5", headers=headers)
+                response = connection.getresponse()
+                return response.status, response.getheader("ETag"), response.read()
+            finally:
+                connection.close()
+
+        with patch.object(FlagStatusHandler, "log_message"):
+            status, etag, body = fetch()
+            self.assertEqual(status, 200)
+            self.assertEqual(len(json.loads(body)["history"]), 5)
+            self.assertEqual(fetch()[1], etag)
+            self.assertEqual(fetch(**{"If-None-Match": etag}), (304, etag, b""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.api.check_status import FlagStatusChecker, KnownOrderIndex
+from src.api.history_log import HistoryLog
+from src.api.status_store import StatusStore
+
+
+UTC = timezone.utc
+NOW = datetime(2026, 7, 12, 18, 0, tzinfo=UTC)
+
+
+def record(seq, **entry):
+    return {"seq": seq, "recorded": NOW.isoformat(), "entry": entry}
+
+
+class StatusStoreTests(unittest.TestCase):
+    def test_history_is_deduplicated_by_order_and_filterable(self):
+        store = StatusStore(":memory:")
+        store.record_history(
+            [
+                record(1, date="2025-09-10", status="half-staff", id="kirk", source="The White House"),
+                record(2, date="2025-09-15", status="full-staff", source="HalfStaff.org"),
+                record(3, date="2026-07-12", status="half-staff", source="News"),
+                record(4, date="2026-07-12", status="half-staff", source="The White House", id="graham"),
+                record(5, date="2026-07-13", status="half-staff", id="kirk", source="The White House"),
+            ]
+        )
+
+        self.assertEqual(
+            [(entry["date"], entry.get("id")) for entry in store.history()],
+            [("2026-07-13", "kirk"), ("2026-07-12", "graham"), ("2025-09-15", None)],
+        )
+        self.assertEqual(len(store.history(source="The White House")), 2)
+        self.assertEqual(store.history(status="full-staff", limit=1)[0]["source"], "HalfStaff.org")
+
+    def test_known_orders_sync_once_per_digest(self):
+        store = StatusStore(":memory:")
+        index = KnownOrderIndex(
+            [
+                {"id": "old", "starts": "2026-07-01T00:00:00Z", "expires": "2026-07-02T00:00:00Z"},
+                {"id": "graham", "starts": "2026-07-12T17:29:00Z", "expires": "2026-07-18T22:00:00Z"},
+            ]
+        )
+        self.assertTrue(store.sync_known_orders(index.entries(), "digest-1"))
+        self.assertFalse(store.sync_known_orders(index.entries(), "digest-1"))
+        rows = store._db.execute("SELECT id, starts FROM known_orders ORDER BY starts").fetchall()
+        self.assertEqual([row[0] for row in rows], ["old", "graham"])
+
+    def test_checker_exports_history_and_reads_status_from_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checker = FlagStatusChecker(now=NOW)
+            checker.history_file = str(Path(directory) / "history.json")
+            checker.history_log = HistoryLog(str(Path(directory) / "history"))
+            checker.store = StatusStore(str(Path(directory) / "status.sqlite"))
+            checker._append_history(
+                {"last_updated": NOW.isoformat(), "status": "half-staff", "source": "News"}
+            )
+            checker.source_signals = {"breaking-news": {"status": "half-staff"}}
+            checker.store.record_run(
+                {"status": "half-staff", "checked_sources": [{"name": "breaking-news", "available": True}]},
+                NOW,
+                checker.source_signals,
+            )
+
+            published = json.loads(Path(checker.history_file).read_text(encoding="utf-8"))
+            self.assertEqual(published["history"][0]["source"], "News")
+            self.assertEqual(checker._read_existing_status()["status"], "half-staff")
+            observation = checker.store.observations("breaking-news")[0]
+            self.assertEqual(observation["signal"], {"status": "half-staff"})
+
+
+if __name__ == "__main__":
+    unittest.main()